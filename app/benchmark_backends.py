@@ -0,0 +1,85 @@
+"""
+Benchmark the PostgreSQL and DuckDB/Parquet backends on the same workload:
+Q1–Q4, the dashboard aggregates and the full dashboard load.
+
+    python benchmark_backends.py [--repeat 5] [--backends postgres duckdb] [--json out.json]
+    python benchmark_backends.py --approx 1     # also time the sampled Q3/Q4 variants
+
+Each query runs once to warm up, then `--repeat` timed runs; the table shows
+median and max wall time per backend and the DuckDB speed-up.
+"""
+
+import argparse
+import json
+import statistics
+import time
+import pandas as pd
+from backends import BACKENDS, get_backend
+from queries import ALL_QUERIES, APPROX_QUERIES, approx_query
+
+
+def time_call(fn, repeat):
+    fn()  # warm-up (connection, file cache, plan cache)
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def run_benchmark(backend, repeat, approx_percent=None):
+    results = {}
+    workload = {name: (lambda sql=sql: backend.query(sql)) for name, sql in ALL_QUERIES.items()}
+    if approx_percent:
+        for name in APPROX_QUERIES:
+            sql = approx_query(name, backend, approx_percent)
+            workload[f"{name}~{approx_percent:g}%"] = lambda sql=sql: backend.query(sql)
+    workload["load_dashboard"] = backend.load_dashboard
+    for name, fn in workload.items():
+        timings = time_call(fn, repeat)
+        results[name] = {
+            "median_ms": statistics.median(timings),
+            "max_ms": max(timings),
+            "runs": timings,
+        }
+        print(f"  {name:30s} median {results[name]['median_ms']:9.1f} ms")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=5, help="timed runs per query (default: 5)")
+    parser.add_argument("--backends", nargs="+", choices=sorted(BACKENDS), default=["postgres", "duckdb"])
+    parser.add_argument("--json", help="also write raw timings to this file")
+    parser.add_argument("--approx", type=float, metavar="PERCENT",
+                        help="also time the approximate Q3/Q4 variants on a PERCENT%% sample")
+    args = parser.parse_args()
+
+    all_results = {}
+    for name in args.backends:
+        print(f"⏱️  Benchmarking {name} ...")
+        try:
+            backend = get_backend(name)
+        except Exception as e:
+            print(f"❌ Skipping {name}: {e}")
+            continue
+        all_results[name] = run_benchmark(backend, args.repeat, args.approx)
+
+    summary = pd.DataFrame({
+        f"{name}_median_ms": {q: r["median_ms"] for q, r in results.items()}
+        for name, results in all_results.items()
+    })
+    if {"postgres_median_ms", "duckdb_median_ms"} <= set(summary.columns):
+        summary["duckdb_speedup"] = summary["postgres_median_ms"] / summary["duckdb_median_ms"]
+    print("\n📊 Summary")
+    print(summary.round(2).to_string())
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"repeat": args.repeat, "results": all_results}, f, indent=2)
+        print(f"\n💾 Raw timings written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,403 @@
+"""
+Concurrent-user load test for the dashboard (capacity curve for one container).
+
+    python loadtest.py --users 1 2 4 8 16 32 --duration 60 [--think 2] [--label my-change]
+    python loadtest.py --users 1 4 16 --baseline loadtests/capacity_<ts>.json
+
+Each simulated user is a headless Streamlit session (streamlit.testing AppTest)
+running app.py in its own worker process: AppTest is not thread-safe, so
+sessions cannot share one process the way the server's script threads do.
+For every step N, N workers first run one untimed warm-up session (loading
+the dataset into that worker's st.cache_* caches), then start together and
+keep applying random filter combinations (date range, hospitals, doctors,
+admission types, insurers, conditions, revenue granularity), sleeping
+--think seconds (exponential) between interactions.
+
+What that means for the numbers: every worker holds its own copy of the
+cached dataset and warms its own caches, where one server shares them across
+sessions, and the workers do not contend for one GIL. Latency is therefore
+optimistic for CPU-bound reruns; memory is reported as the summed RSS of
+the workers plus, closer to what one more session costs a server, the
+per-user growth over each worker's warm RSS.
+
+Recorded per step: rerun latency percentiles, reruns/sec, app errors
+(exceptions raised by app.py, rerun timeouts), harness errors (failures of
+the load test itself, e.g. a widget it could not drive or a crashed worker),
+worker RSS and the number of client connections to the database
+(pg_stat_activity). The curve is written to loadtests/capacity_<ts>.csv and
+.json; use the largest N whose p95 stays within --slo-ms to size replicas.
+Steps with harness errors are not valid measurements and never count
+towards that N. Point the app at a database loaded with
+generate_synthetic_data.py + ingest_data.py --csv + dbt run for realistic
+volumes. Set DASHBOARD_TRACE_PATH as well to get per-section percentiles for
+the same run from trace_report.py.
+"""
+
+import argparse
+import json
+import multiprocessing as mp
+import os
+import queue
+import random
+import threading
+import time
+from datetime import datetime, timedelta
+import pandas as pd
+from sqlalchemy import create_engine, text
+from sqlalchemy.pool import NullPool
+from streamlit.testing.v1 import AppTest
+from backends import ANALYTICS_BACKEND, DB_URL
+
+APP_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "app.py")
+OUT_DIR = "loadtests"
+
+# Interactions whose latency is measured (warm-up and harness records are not)
+TIMED_KINDS = ["session_start", "filter", "granularity"]
+RESULT_COLUMNS = ["user", "kind", "ms", "error", "harness_error"]
+
+# Client sessions on the dashboard's database, excluding the sampler itself
+DB_CONNECTIONS_SQL = """
+    SELECT count(*)
+    FROM pg_stat_activity
+    WHERE datname = current_database()
+      AND backend_type = 'client backend'
+      AND pid <> pg_backend_pid()
+"""
+
+
+def rss_mb(pid="self"):
+    """Current resident set size of a process in MB (Linux /proc; None elsewhere or once it exited)."""
+    try:
+        with open(f"/proc/{pid}/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+# -----------------------------------------------------------------------------
+# Resource sampler (worker RSS + DB connections) running alongside each step
+# -----------------------------------------------------------------------------
+class Sampler(threading.Thread):
+    def __init__(self, db_url, interval, pids):
+        super().__init__(daemon=True)
+        self.interval = interval
+        self.pids = pids
+        self.samples = []
+        self._stop_event = threading.Event()
+        self._conn = None
+        if db_url:
+            try:
+                self._conn = create_engine(db_url, poolclass=NullPool).connect()
+            except Exception as e:
+                print(f"⚠️  DB connection sampling disabled: {e}")
+
+    def db_connections(self):
+        if self._conn is None:
+            return None
+        try:
+            return self._conn.execute(text(DB_CONNECTIONS_SQL)).scalar()
+        except Exception:
+            return None
+
+    def workers_rss(self):
+        rss = [r for r in (rss_mb(pid) for pid in self.pids) if r is not None]
+        return sum(rss) if rss else None
+
+    def run(self):
+        while not self._stop_event.is_set():
+            self.samples.append({"t": time.time(), "rss_mb": self.workers_rss(), "db_connections": self.db_connections()})
+            self._stop_event.wait(self.interval)
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+        if self._conn is not None:
+            self._conn.close()
+
+
+# -----------------------------------------------------------------------------
+# One simulated user
+# -----------------------------------------------------------------------------
+def random_date_range(rng, lo, hi):
+    span = (hi - lo).days
+    if span <= 0:
+        return lo, hi
+    start = lo + timedelta(days=rng.randrange(span + 1))
+    end = start + timedelta(days=rng.randrange((hi - start).days + 1))
+    return start, end
+
+
+def apply_random_filters(at, rng, bounds, max_filters):
+    """Set a random date range and 0..max_filters category filters, then submit the form."""
+    start, end = random_date_range(rng, *bounds) if rng.random() < 0.7 else bounds
+    at.sidebar.date_input[0].set_value(start)
+    at.sidebar.date_input[1].set_value(end)
+
+    multiselects = list(at.sidebar.multiselect)
+    for ms in multiselects:
+        ms.set_value([])
+    for ms in rng.sample(multiselects, rng.randint(0, min(max_filters, len(multiselects)))):
+        if ms.options:
+            ms.set_value(rng.sample(list(ms.options), rng.randint(1, min(3, len(ms.options)))))
+    at.sidebar.button[0].click()
+
+
+def record(user_id, kind, ms=None, error=None, harness_error=None):
+    return {"user": user_id, "kind": kind, "ms": ms, "error": error, "harness_error": harness_error}
+
+
+def rerun(at):
+    """Run the script once; the app's error message, or None (AppTest raises on a timeout)."""
+    try:
+        at.run()
+    except Exception as e:
+        return f"{type(e).__name__}: {e}"
+    return at.exception[0].message if at.exception else None
+
+
+def run_user(user_id, deadline, args, results):
+    rng = random.Random(args.seed * 100_003 + user_id)
+    at = AppTest.from_file(APP_SCRIPT, default_timeout=args.timeout)
+
+    def timed_run(kind):
+        start = time.perf_counter()
+        error = rerun(at)
+        results.append(record(user_id, kind, (time.perf_counter() - start) * 1000, error))
+        return error is None
+
+    if not timed_run("session_start") or not at.sidebar.date_input:
+        return
+    bounds = (at.sidebar.date_input[0].value, at.sidebar.date_input[1].value)
+
+    while time.time() < deadline:
+        if args.think:
+            time.sleep(rng.expovariate(1 / args.think))
+            if time.time() >= deadline:
+                break
+        kind = "filter" if rng.random() < 0.8 else "granularity"
+        try:
+            if kind == "filter":
+                apply_random_filters(at, rng, bounds, args.max_filters)
+            else:
+                grain = at.radio(key="revenue_grain")
+                grain.set_value("Monthly" if grain.value == "Daily" else "Daily")
+        except Exception as e:
+            # The harness could not drive the session; its state is unknown from here on.
+            results.append(record(user_id, kind, harness_error=f"{type(e).__name__}: {e}"))
+            return
+        timed_run(kind)
+
+
+def user_process(user_id, n_users, args, messages, start, deadline):
+    """Worker process for one simulated user: warm up, wait for the step to start, run.
+
+    Sends ("ready", user_id, warm RSS in MB) and then ("done", user_id, records).
+    """
+    results = []
+    try:
+        if not args.no_warmup:
+            error = rerun(AppTest.from_file(APP_SCRIPT, default_timeout=args.timeout))
+            if error is not None:
+                results.append(record(user_id, "warmup", error=error))
+        messages.put(("ready", user_id, rss_mb()))
+        start.wait()
+        if args.ramp:
+            time.sleep(args.ramp * user_id / n_users)
+        if not results:
+            run_user(user_id, deadline.value, args, results)
+    except Exception as e:
+        results.append(record(user_id, "harness", harness_error=f"{type(e).__name__}: {e}"))
+    messages.put(("done", user_id, results))
+
+
+# -----------------------------------------------------------------------------
+# Steps and summary
+# -----------------------------------------------------------------------------
+def run_step(n_users, args):
+    # spawn, not fork: the parent runs the sampler thread and has imported streamlit.
+    ctx = mp.get_context("spawn")
+    messages, start, deadline = ctx.Queue(), ctx.Event(), ctx.Value("d", 0.0)
+    workers = {
+        i: ctx.Process(target=user_process, args=(i, n_users, args, messages, start, deadline), daemon=True)
+        for i in range(n_users)
+    }
+    for w in workers.values():
+        w.start()
+
+    warm_rss, results, done = {}, [], set()
+
+    def handle(kind, user_id, payload):
+        if kind == "ready":
+            warm_rss[user_id] = payload
+        else:
+            results.extend(payload)
+            done.add(user_id)
+
+    def receive(owed):
+        """Handle worker messages until none is owed or every worker that owes one has exited."""
+        while owed():
+            try:
+                handle(*messages.get(timeout=1))
+            except queue.Empty:
+                if not any(workers[i].is_alive() for i in owed()):
+                    break
+        while True:  # a worker may have sent its last message just before exiting
+            try:
+                handle(*messages.get(timeout=0.2))
+            except queue.Empty:
+                return
+
+    receive(lambda: {i for i in workers if i not in warm_rss and i not in done})
+    warmup_errors = [r["error"] for r in results if r["kind"] == "warmup"]
+    if warmup_errors:
+        print(f"   ❌ {len(warmup_errors)} warm-up session(s) failed: {warmup_errors[0]}")
+
+    sampler = Sampler(None if args.no_db_sampling else DB_URL, args.sample_interval,
+                      [w.pid for w in workers.values()])
+    sampler.start()
+    started = time.time()
+    deadline.value = started + args.duration
+    start.set()
+    receive(lambda: set(workers) - done)
+    elapsed = time.time() - started
+    sampler.stop()
+
+    for i, w in workers.items():
+        w.join(timeout=5)
+        if w.is_alive():
+            w.terminate()
+        if i not in done:
+            results.append(record(i, "harness", harness_error=f"worker exited (code {w.exitcode}) without reporting"))
+    warm_total = sum(r for r in warm_rss.values() if r is not None) if warm_rss else None
+    return summarize(n_users, results, sampler.samples, elapsed, warm_total), results
+
+
+def summarize(n_users, results, samples, elapsed, warm_rss):
+    runs = pd.DataFrame(results, columns=RESULT_COLUMNS)
+    timed = runs[runs["kind"].isin(TIMED_KINDS)]
+    ok = timed[timed["error"].isna()]
+    interactions = ok[ok["kind"] != "session_start"]["ms"]
+    starts = ok[ok["kind"] == "session_start"]["ms"]
+    res = pd.DataFrame(samples, columns=["t", "rss_mb", "db_connections"])
+    rss_peak = res["rss_mb"].max()
+
+    def pct(series, q):
+        return round(float(series.quantile(q)), 1) if len(series) else None
+
+    return {
+        "users": n_users,
+        "elapsed_s": round(elapsed, 1),
+        "reruns": len(timed),
+        "app_errors": int(runs["error"].notna().sum()),
+        "harness_errors": int(runs["harness_error"].notna().sum()),
+        "reruns_per_s": round(len(timed) / elapsed, 2) if elapsed else None,
+        "p50_ms": pct(interactions, 0.50),
+        "p95_ms": pct(interactions, 0.95),
+        "p99_ms": pct(interactions, 0.99),
+        "max_ms": round(float(interactions.max()), 1) if len(interactions) else None,
+        "session_start_p50_ms": pct(starts, 0.50),
+        "session_start_p95_ms": pct(starts, 0.95),
+        # Summed over the worker processes (each holds its own cached dataset)
+        "rss_peak_mb": None if pd.isna(rss_peak) else round(float(rss_peak), 1),
+        "rss_warm_mb": None if warm_rss is None else round(warm_rss, 1),
+        "rss_per_user_mb": (
+            None if pd.isna(rss_peak) or warm_rss is None
+            else round((float(rss_peak) - warm_rss) / n_users, 2)
+        ),
+        "db_connections_peak": None if res["db_connections"].isna().all() else int(res["db_connections"].max()),
+        "db_connections_mean": (
+            None if res["db_connections"].isna().all() else round(float(res["db_connections"].mean()), 1)
+        ),
+    }
+
+
+def capacity(curve, slo_ms):
+    """Largest N with no app errors and p95 within the SLO (None if even N=1 misses it).
+
+    Steps with harness errors did not measure the app and never qualify.
+    """
+    valid = curve["harness_errors"] == 0
+    within = curve[valid & (curve["app_errors"] == 0) & (curve["p95_ms"] <= slo_ms)]
+    return int(within["users"].max()) if len(within) else None
+
+
+def print_comparison(curve, baseline_path):
+    with open(baseline_path) as f:
+        base = pd.DataFrame(json.load(f)["curve"]).set_index("users")
+    cols = ["p50_ms", "p95_ms", "p99_ms", "reruns_per_s", "rss_peak_mb"]
+    merged = curve.set_index("users")[cols].join(base[cols], rsuffix="_base", how="inner")
+    for col in ["p95_ms", "reruns_per_s"]:
+        merged[f"{col}_change_%"] = (merged[col] / merged[f"{col}_base"] - 1) * 100
+    print(f"\n🆚 Compared with {baseline_path}")
+    print(merged.round(1).to_string())
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, nargs="+", default=[1, 2, 4, 8, 16],
+                        help="concurrent users per step (default: 1 2 4 8 16)")
+    parser.add_argument("--duration", type=float, default=60, help="seconds per step (default: 60)")
+    parser.add_argument("--think", type=float, default=2.0,
+                        help="mean think time between interactions in seconds, 0 for none (default: 2)")
+    parser.add_argument("--ramp", type=float, default=5.0,
+                        help="seconds over which a step's sessions are started (default: 5)")
+    parser.add_argument("--max-filters", type=int, default=2,
+                        help="most category filters set per interaction (default: 2)")
+    parser.add_argument("--timeout", type=float, default=120, help="per-rerun timeout in seconds (default: 120)")
+    parser.add_argument("--sample-interval", type=float, default=0.5,
+                        help="RSS / DB connection sampling interval in seconds (default: 0.5)")
+    parser.add_argument("--slo-ms", type=float, default=2000, help="p95 rerun latency target (default: 2000)")
+    parser.add_argument("--no-warmup", action="store_true",
+                        help="skip the workers' warm-up session (session_start then includes the dataset load)")
+    parser.add_argument("--no-db-sampling", action="store_true", help="skip pg_stat_activity sampling")
+    parser.add_argument("--label", help="free-form tag stored with the results (e.g. branch or change)")
+    parser.add_argument("--baseline", help="earlier capacity JSON to compare against")
+    parser.add_argument("--out-dir", default=OUT_DIR, help=f"output directory (default: {OUT_DIR})")
+    parser.add_argument("--seed", type=int, default=7)
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    print(f"🚦 Load test against {APP_SCRIPT} (backend: {ANALYTICS_BACKEND}, one process per user)")
+
+    curve, raw = [], {}
+    for n_users in args.users:
+        print(f"👥 {n_users} concurrent users for {args.duration:.0f} s ...")
+        summary, results = run_step(n_users, args)
+        curve.append(summary)
+        raw[n_users] = results
+        print(f"   reruns {summary['reruns']:,}  app errors {summary['app_errors']}  "
+              f"harness errors {summary['harness_errors']}  "
+              f"p50 {summary['p50_ms']} ms  p95 {summary['p95_ms']} ms  p99 {summary['p99_ms']} ms  "
+              f"RSS {summary['rss_peak_mb']} MB  DB conns {summary['db_connections_peak']}")
+        if summary["harness_errors"]:
+            first = next(r["harness_error"] for r in results if r["harness_error"])
+            print(f"   ⚠️  Step invalid (harness errors), first: {first}")
+
+    curve = pd.DataFrame(curve)
+    print("\n📈 Capacity curve")
+    print(curve.to_string(index=False))
+    max_users = capacity(curve, args.slo_ms)
+    print(f"\n🎯 Max users within p95 ≤ {args.slo_ms:,.0f} ms: {max_users if max_users is not None else 'none'}")
+
+    if args.baseline:
+        print_comparison(curve, args.baseline)
+
+    os.makedirs(args.out_dir, exist_ok=True)
+    stem = os.path.join(args.out_dir, f"capacity_{datetime.now():%Y%m%d_%H%M%S}")
+    curve.to_csv(f"{stem}.csv", index=False)
+    with open(f"{stem}.json", "w") as f:
+        json.dump({
+            "label": args.label,
+            "backend": ANALYTICS_BACKEND,
+            "settings": vars(args),
+            "max_users_within_slo": max_users,
+            "curve": curve.to_dict(orient="records"),
+            "reruns": {str(n): r for n, r in raw.items()},
+        }, f, indent=2, default=str)
+    print(f"💾 Written to {stem}.csv and {stem}.json")
+
+
+if __name__ == "__main__":
+    main()
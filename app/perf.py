@@ -0,0 +1,90 @@
+"""
+Lightweight per-rerun instrumentation for the Streamlit dashboard.
+
+Every rerun gets a RerunTrace that times named sections (`with trace.section(...)`)
+and records whether each cached function was a cache hit or miss. At the end
+of the rerun the trace can be shown in the sidebar debug panel and appended to
+a JSONL file for offline aggregation (see trace_report.py).
+
+    DASHBOARD_DEBUG=1                 show the timing panel (or open the app with ?debug=1)
+    DASHBOARD_TRACE_PATH=traces.jsonl append one JSON line per completed rerun
+"""
+
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+DEBUG_DEFAULT = os.getenv("DASHBOARD_DEBUG", "0") == "1"
+TRACE_PATH = os.getenv("DASHBOARD_TRACE_PATH")
+
+# Streamlit runs each session's script on its own thread, so cached function
+# bodies (which only execute on a cache miss) can report back through here.
+_local = threading.local()
+_write_lock = threading.Lock()
+
+
+def mark_cache_miss(name):
+    """Call at the top of a cached function body: it only runs on a miss."""
+    misses = getattr(_local, "misses", None)
+    if misses is not None:
+        misses.add(name)
+
+
+class RerunTrace:
+    def __init__(self, session_id, rerun):
+        self.session_id = session_id
+        self.rerun = rerun
+        self.started_at = datetime.now(timezone.utc)
+        self.sections = {}
+        self.cache = {}
+        self.meta = {}
+        self._t0 = time.perf_counter()
+        _local.misses = set()
+
+    @contextmanager
+    def section(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            # Accumulate, so a section entered more than once reports its total.
+            self.sections[name] = self.sections.get(name, 0.0) + (time.perf_counter() - start) * 1000
+
+    def cached(self, name, fn, *args, **kwargs):
+        """Call a st.cache_* function, timing it and recording hit/miss under `name`."""
+        _local.misses.discard(name)
+        with self.section(name):
+            result = fn(*args, **kwargs)
+        status = "miss" if name in _local.misses else "hit"
+        # Several calls under one name: any miss makes the rerun a miss.
+        if self.cache.get(name) != "miss":
+            self.cache[name] = status
+        return result
+
+    def total_ms(self):
+        return (time.perf_counter() - self._t0) * 1000
+
+    def to_record(self):
+        return {
+            "ts": self.started_at.isoformat(),
+            "session_id": self.session_id,
+            "rerun": self.rerun,
+            "total_ms": round(self.total_ms(), 3),
+            "sections": {k: round(v, 3) for k, v in self.sections.items()},
+            "cache": dict(self.cache),
+            **self.meta,
+        }
+
+
+def append_trace(record, path=TRACE_PATH):
+    """Append one rerun record to the JSONL trace file (no-op when tracing is off)."""
+    if not path:
+        return
+    line = json.dumps(record) + "\n"
+    with _write_lock:
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, "a") as f:
+            f.write(line)
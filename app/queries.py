@@ -0,0 +1,248 @@
+"""
+Analytical queries over the star schema, written once in the SQL subset that
+both PostgreSQL (analytics_staging schema) and DuckDB (Parquet export) accept.
+
+Table names are unqualified: the PostgreSQL backend sets search_path to the
+dbt schema and the DuckDB backend registers one view per exported table.
+"""
+
+# -----------------------------------------------------------------------------
+# Q1–Q4 (sql/advanced_queries.sql, rewritten against the star schema)
+# -----------------------------------------------------------------------------
+STAR_QUERIES = {
+    "q1_hospital_revenue": """
+        SELECT
+            h.hospital_name,
+            COUNT(f.admission_key) AS total_admissions,
+            SUM(f.billing_amount) AS total_revenue,
+            ROUND(AVG(f.billing_amount), 2) AS avg_bill_per_admission,
+            RANK() OVER (ORDER BY SUM(f.billing_amount) DESC) AS revenue_rank
+        FROM fact_admissions f
+        JOIN dim_hospital h
+            ON f.hospital_key = h.hospital_key
+        GROUP BY h.hospital_name
+        ORDER BY total_revenue DESC
+    """,
+
+    "q2_readmissions_30d": """
+        WITH ordered_admissions AS (
+            SELECT
+                f.admission_key,
+                f.patient_key,
+                d.full_date AS admission_date,
+                LAG(d.full_date) OVER (
+                    PARTITION BY f.patient_key
+                    ORDER BY d.full_date
+                ) AS previous_admission_date
+            FROM fact_admissions f
+            JOIN dim_date d
+                ON f.admission_date_key = d.date_key
+        )
+        SELECT
+            oa.patient_key,
+            p.name AS patient_name,
+            oa.admission_key,
+            oa.admission_date,
+            oa.previous_admission_date,
+            oa.admission_date - oa.previous_admission_date AS days_since_last_admission
+        FROM ordered_admissions oa
+        JOIN dim_patient p
+            ON oa.patient_key = p.patient_key
+        WHERE oa.previous_admission_date IS NOT NULL
+          AND oa.admission_date - oa.previous_admission_date <= 30
+        ORDER BY oa.patient_key, oa.admission_date
+    """,
+
+    "q3_test_results_by_condition": """
+        SELECT
+            c.condition_name,
+            COUNT(*) AS total_tests,
+            SUM(CASE WHEN f.tr = 'Normal' THEN 1 ELSE 0 END) AS normal_count,
+            SUM(CASE WHEN f.tr = 'Abnormal' THEN 1 ELSE 0 END) AS abnormal_count,
+            SUM(CASE WHEN f.tr = 'Inconclusive' THEN 1 ELSE 0 END) AS inconclusive_count,
+            ROUND(
+                100.0 * SUM(CASE WHEN f.tr = 'Abnormal' THEN 1 ELSE 0 END)
+                / NULLIF(COUNT(*), 0),
+                2
+            ) AS abnormal_rate_percent
+        FROM fact_admissions f
+        JOIN dim_medical_condition c
+            ON f.condition_key = c.condition_key
+        WHERE f.tr IS NOT NULL
+        GROUP BY c.condition_name
+        ORDER BY abnormal_rate_percent DESC
+    """,
+
+    "q4_insurers_above_avg": """
+        WITH provider_stats AS (
+            SELECT
+                i.provider_name,
+                COUNT(f.admission_key) AS total_admissions,
+                AVG(f.billing_amount) AS avg_bill
+            FROM fact_admissions f
+            JOIN dim_insurer i
+                ON f.insurer_key = i.insurer_key
+            GROUP BY i.provider_name
+        ),
+        overall AS (
+            SELECT AVG(billing_amount) AS overall_avg
+            FROM fact_admissions
+        )
+        SELECT
+            p.provider_name,
+            p.total_admissions,
+            ROUND(p.avg_bill, 2) AS avg_bill,
+            ROUND(o.overall_avg, 2) AS overall_avg_across_all_providers
+        FROM provider_stats p
+        CROSS JOIN overall o
+        WHERE p.avg_bill > o.overall_avg
+        ORDER BY p.avg_bill DESC
+    """,
+}
+
+# -----------------------------------------------------------------------------
+# Dashboard aggregates (the unfiltered KPI row and chart rollups of app.py)
+# -----------------------------------------------------------------------------
+DASHBOARD_AGGREGATES = {
+    "kpis": """
+        SELECT
+            SUM(billing_amount) AS revenue,
+            COUNT(*) AS admissions,
+            COUNT(DISTINCT doctor_key) AS doctors,
+            COUNT(DISTINCT hospital_key) AS hospitals,
+            AVG(los_days) AS avg_los
+        FROM dashboard_admissions
+    """,
+
+    "hospital_revenue_top15": """
+        SELECT display_hospital, SUM(billing_amount) AS billing_amount
+        FROM dashboard_admissions
+        GROUP BY display_hospital
+        ORDER BY billing_amount DESC
+        LIMIT 15
+    """,
+
+    "admissions_by_weekday": """
+        SELECT day_of_week_num, COUNT(*) AS admissions
+        FROM dashboard_admissions
+        GROUP BY day_of_week_num
+        ORDER BY day_of_week_num
+    """,
+
+    "los_by_month": """
+        SELECT admission_month_key, AVG(los_days) AS avg_los
+        FROM dashboard_admissions
+        GROUP BY admission_month_key
+        ORDER BY admission_month_key
+    """,
+
+    "revenue_by_day": """
+        SELECT admission_date_key, SUM(billing_amount) AS billing_amount
+        FROM dashboard_admissions
+        GROUP BY admission_date_key
+        ORDER BY admission_date_key
+    """,
+
+    "revenue_by_type": """
+        SELECT display_type, SUM(billing_amount) AS billing_amount
+        FROM dashboard_admissions
+        GROUP BY display_type
+    """,
+
+    "revenue_by_insurer": """
+        SELECT insurance_provider, SUM(billing_amount) AS billing_amount
+        FROM dashboard_admissions
+        GROUP BY insurance_provider
+    """,
+
+    "top_doctors": """
+        SELECT display_doctor, COUNT(*) AS patients
+        FROM dashboard_admissions
+        GROUP BY display_doctor
+        ORDER BY patients DESC
+        LIMIT 10
+    """,
+}
+
+# -----------------------------------------------------------------------------
+# Approximate Q3 / Q4 over a Bernoulli sample of fact_admissions
+# -----------------------------------------------------------------------------
+# {fact} is replaced by "fact_admissions f <sampling clause>" (backend-specific,
+# see tablesample() in backends.py) and {scale} by 100 / sample percent. Rates and means
+# come with 95% confidence half-widths; counts are scaled-up estimates. The
+# approximate Q4 lists every provider and flags the ones significantly above
+# the overall average instead of filtering on the noisy point estimate.
+# On PostgreSQL this needs fact_admissions to be a table (dbt materializes it
+# as one); TABLESAMPLE is not allowed on views.
+APPROX_QUERIES = {
+    "q3_test_results_by_condition": """
+        WITH sampled AS (
+            SELECT
+                c.condition_name,
+                COUNT(*) AS sampled_tests,
+                SUM(CASE WHEN f.tr = 'Abnormal' THEN 1 ELSE 0 END) AS sampled_abnormal
+            FROM {fact}
+            JOIN dim_medical_condition c
+                ON f.condition_key = c.condition_key
+            WHERE f.tr IS NOT NULL
+            GROUP BY c.condition_name
+        )
+        SELECT
+            condition_name,
+            ROUND(CAST(sampled_tests * {scale} AS NUMERIC), 0) AS est_total_tests,
+            sampled_tests,
+            ROUND(CAST(100.0 * sampled_abnormal / sampled_tests AS NUMERIC), 2) AS abnormal_rate_percent,
+            ROUND(CAST(
+                196.0 * SQRT((1.0 * sampled_abnormal / sampled_tests)
+                             * (1 - 1.0 * sampled_abnormal / sampled_tests) / sampled_tests)
+            AS NUMERIC), 2) AS abnormal_rate_ci95_pp
+        FROM sampled
+        ORDER BY abnormal_rate_percent DESC
+    """,
+
+    "q4_insurers_above_avg": """
+        WITH sampled_bills AS (
+            SELECT f.insurer_key, CAST(f.billing_amount AS DOUBLE PRECISION) AS billing_amount
+            FROM {fact}
+        ),
+        provider_stats AS (
+            SELECT
+                i.provider_name,
+                COUNT(*) AS sampled_admissions,
+                AVG(s.billing_amount) AS avg_bill,
+                STDDEV_SAMP(s.billing_amount) / SQRT(COUNT(*)) AS se_bill
+            FROM sampled_bills s
+            JOIN dim_insurer i
+                ON s.insurer_key = i.insurer_key
+            GROUP BY i.provider_name
+        ),
+        overall AS (
+            SELECT AVG(billing_amount) AS overall_avg
+            FROM sampled_bills
+        )
+        SELECT
+            p.provider_name,
+            ROUND(CAST(p.sampled_admissions * {scale} AS NUMERIC), 0) AS est_total_admissions,
+            ROUND(CAST(p.avg_bill AS NUMERIC), 2) AS avg_bill,
+            ROUND(CAST(1.96 * p.se_bill AS NUMERIC), 2) AS avg_bill_ci95,
+            ROUND(CAST(o.overall_avg AS NUMERIC), 2) AS overall_avg_across_all_providers,
+            -- Sample means sit within noise of the overall mean; only flag a
+            -- provider whose 95% interval lies entirely above it. (The overall
+            -- mean, pooled over every provider, has a much narrower interval.)
+            COALESCE(p.avg_bill - 1.96 * p.se_bill > o.overall_avg, FALSE) AS above_average
+        FROM provider_stats p
+        CROSS JOIN overall o
+        ORDER BY p.avg_bill DESC
+    """,
+}
+
+
+def approx_query(name, backend, percent, seed=42):
+    """Render an APPROX_QUERIES entry for `backend` at a `percent` sample."""
+    return APPROX_QUERIES[name].format(
+        fact=f"fact_admissions f {backend.tablesample(percent, seed)}",
+        scale=100.0 / percent,
+    )
+
+
+ALL_QUERIES = {**STAR_QUERIES, **DASHBOARD_AGGREGATES}
@@ -0,0 +1,66 @@
+"""
+Ad-hoc query CLI over the analytics backends.
+
+    python query_cli.py --list
+    python query_cli.py q1_hospital_revenue
+    python query_cli.py --backend duckdb q3_test_results_by_condition
+    python query_cli.py --backend duckdb --sql "SELECT COUNT(*) FROM fact_admissions"
+    python query_cli.py --approx 1 q4_insurers_above_avg     # 1% Bernoulli sample, with 95% CIs
+
+The backend defaults to ANALYTICS_BACKEND (see backends.py).
+"""
+
+import argparse
+import sys
+import time
+from backends import BACKENDS, get_backend
+from queries import ALL_QUERIES, APPROX_QUERIES, approx_query
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("query", nargs="?", help="name of a predefined query (see --list)")
+    parser.add_argument("--sql", help="run this SQL instead of a predefined query")
+    parser.add_argument("--backend", choices=sorted(BACKENDS), help="override ANALYTICS_BACKEND")
+    parser.add_argument("--limit", type=int, default=50, help="rows to print (default: 50)")
+    parser.add_argument("--list", action="store_true", help="list predefined queries and exit")
+    parser.add_argument("--approx", type=float, metavar="PERCENT",
+                        help=f"run the approximate variant on a PERCENT%% sample ({', '.join(APPROX_QUERIES)})")
+    parser.add_argument("--seed", type=int, default=42, help="sample seed for --approx (default: 42)")
+    args = parser.parse_args()
+
+    if args.list:
+        for name in ALL_QUERIES:
+            print(f"{name}  (--approx)" if name in APPROX_QUERIES else name)
+        return
+
+    if args.approx is not None:
+        if args.query not in APPROX_QUERIES:
+            parser.error(f"--approx is available for: {', '.join(APPROX_QUERIES)}")
+        if not 0 < args.approx <= 100:
+            parser.error("--approx PERCENT must be in (0, 100]")
+    elif args.sql:
+        sql = args.sql
+    elif args.query in ALL_QUERIES:
+        sql = ALL_QUERIES[args.query]
+    else:
+        parser.error("give a predefined query name (see --list) or --sql")
+
+    try:
+        backend = get_backend(args.backend)
+        if args.approx is not None:
+            sql = approx_query(args.query, backend, args.approx, args.seed)
+        start = time.perf_counter()
+        df = backend.query(sql)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+    except Exception as e:
+        print(f"❌ Query failed: {e}")
+        sys.exit(1)
+
+    print(df.head(args.limit).to_string(index=False))
+    sampled = f", {args.approx:g}% sample" if args.approx is not None else ""
+    print(f"\n{len(df):,} rows in {elapsed_ms:.1f} ms ({backend.name}{sampled})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,184 @@
+"""
+Process-wide, read-only dashboard dataset shared by every Streamlit session.
+
+The dashboard_admissions frame is loaded once per process (st.cache_resource,
+no pickling or per-session copies), sorted by admission_date and stored as
+column arrays flagged read-only. Grouping columns are dictionary-encoded once
+into integer codes. Sessions never copy the table:
+
+- filtering returns a *selection* (a slice for a pure date range, otherwise
+  an int64 index array); a date range is a binary search on the sorted dates
+- KPIs and chart rollups are computed straight from the shared arrays with
+  np.bincount over the selected codes
+- only charts that need raw rows (box plot, histogram, data table, CSV) call
+  take(), and then only for the rows and columns they draw
+"""
+
+import numpy as np
+import pandas as pd
+
+# Columns dictionary-encoded for filtering / grouping
+ENCODED_COLS = [
+    "display_hospital",
+    "display_doctor",
+    "display_type",
+    "insurance_provider",
+    "medical_condition",
+    "test_result",
+    "gender",
+    "blood_type",
+    "day_of_week",
+    "day_of_week_num",
+    "admission_date_key",
+    "admission_month_key",
+    "doctor_key",
+    "hospital_key",
+    "patient_key",
+]
+
+
+def _read_only(arr):
+    arr = np.asarray(arr)
+    arr.flags.writeable = False
+    return arr
+
+
+class SharedDataset:
+    def __init__(self, frame, date_col="admission_date"):
+        frame = frame.sort_values(date_col, kind="stable").reset_index(drop=True)
+        self.date_col = date_col
+        self.columns = list(frame.columns)
+        self.n_rows = len(frame)
+        self.codes = {}
+        self.labels = {}
+        self.values = {}
+        for col in self.columns:
+            series = frame[col]
+            if col in ENCODED_COLS:
+                # Codes use pandas' convention: -1 marks a missing value.
+                if isinstance(series.dtype, pd.CategoricalDtype):
+                    codes, labels = series.cat.codes.to_numpy(), series.cat.categories
+                else:
+                    codes, labels = pd.factorize(series, sort=True)
+                self.codes[col] = _read_only(codes.astype(np.int32))
+                self.labels[col] = labels
+            elif pd.api.types.is_extension_array_dtype(series.dtype) and pd.api.types.is_numeric_dtype(series.dtype):
+                # Nullable integers (e.g. los_days) become float arrays with NaN.
+                self.values[col] = _read_only(series.to_numpy(dtype=float, na_value=np.nan))
+            else:
+                self.values[col] = _read_only(series.to_numpy())
+        self.dates = self.values[date_col]
+        self._options = {}
+
+    # -------------------------------------------------------------------------
+    # Selection
+    # -------------------------------------------------------------------------
+    def size(self, sel):
+        return sel.stop - sel.start if isinstance(sel, slice) else len(sel)
+
+    def options(self, col):
+        """Sorted distinct labels of an encoded column (for filter widgets)."""
+        # Computed once per process; concurrent first calls just compute it twice.
+        if col not in self._options:
+            self._options[col] = sorted(str(v) for v in self.labels[col])
+        return self._options[col]
+
+    def select(self, start, end, **filters):
+        """Rows with start <= date <= end matching every {column: [labels]} filter.
+
+        Returns a slice (zero-copy) when only the date range applies,
+        otherwise an int64 index array into the shared columns.
+        """
+        lo = int(np.searchsorted(self.dates, np.datetime64(pd.Timestamp(start)), side="left"))
+        hi = int(np.searchsorted(self.dates, np.datetime64(pd.Timestamp(end)), side="right"))
+        sel = slice(lo, hi)
+
+        keep = None
+        for col, chosen in filters.items():
+            if not chosen:
+                continue
+            lut = np.zeros(len(self.labels[col]) + 1, dtype=bool)  # last slot: missing (-1)
+            lut[self.labels[col].get_indexer(chosen)] = True
+            lut[-1] = False
+            match = lut[self.codes[col][sel]]
+            keep = match if keep is None else (keep & match)
+
+        if keep is None:
+            return sel
+        return lo + np.flatnonzero(keep)
+
+    # -------------------------------------------------------------------------
+    # Aggregates over a selection
+    # -------------------------------------------------------------------------
+    def sum(self, col, sel):
+        return float(np.nansum(self.values[col][sel]))
+
+    def mean(self, col, sel):
+        vals = self.values[col][sel]
+        return float(np.nanmean(vals)) if np.isfinite(vals).any() else float("nan")
+
+    def nunique(self, col, sel):
+        codes = self.codes[col][sel]
+        codes = codes[codes >= 0]
+        return int(np.count_nonzero(np.bincount(codes, minlength=len(self.labels[col]))))
+
+    def group_count(self, col, sel):
+        """Row count per label of `col` (labels with zero rows dropped)."""
+        codes = self.codes[col][sel]
+        codes = codes[codes >= 0]
+        counts = np.bincount(codes, minlength=len(self.labels[col]))
+        return self._to_series(col, counts, counts > 0)
+
+    def group_sum(self, col, value_col, sel):
+        codes, vals = self._valid(col, value_col, sel)
+        sums = np.bincount(codes, weights=vals, minlength=len(self.labels[col]))
+        counts = np.bincount(codes, minlength=len(self.labels[col]))
+        return self._to_series(col, sums, counts > 0)
+
+    def group_mean(self, col, value_col, sel):
+        codes, vals = self._valid(col, value_col, sel)
+        sums = np.bincount(codes, weights=vals, minlength=len(self.labels[col]))
+        counts = np.bincount(codes, minlength=len(self.labels[col]))
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return self._to_series(col, sums / counts, counts > 0)
+
+    def cross_count(self, outer, inner, sel, weights=None):
+        """Row counts (or sums of a `weights` column) per (outer, inner) label pair as a long DataFrame."""
+        a, b = self.codes[outer][sel], self.codes[inner][sel]
+        ok = (a >= 0) & (b >= 0)
+        w = None if weights is None else self.values[weights][sel][ok]
+        n_inner = len(self.labels[inner])
+        counts = np.bincount(a[ok] * n_inner + b[ok], weights=w, minlength=len(self.labels[outer]) * n_inner)
+        nz = np.flatnonzero(counts)
+        return pd.DataFrame({
+            outer: self.labels[outer].take(nz // n_inner),
+            inner: self.labels[inner].take(nz % n_inner),
+            "count": counts[nz],
+        })
+
+    def _valid(self, col, value_col, sel):
+        codes, vals = self.codes[col][sel], self.values[value_col][sel].astype(float, copy=False)
+        ok = (codes >= 0) & ~np.isnan(vals)
+        return codes[ok], vals[ok]
+
+    def _to_series(self, col, values, present):
+        return pd.Series(values[present], index=self.labels[col][present], name=col)
+
+    # -------------------------------------------------------------------------
+    # Materialization (only for charts / exports that need raw rows)
+    # -------------------------------------------------------------------------
+    def take(self, sel, columns=None):
+        """A new DataFrame with just the selected rows and columns."""
+        data = {}
+        for col in columns or self.columns:
+            if col in self.codes:
+                data[col] = pd.Categorical.from_codes(self.codes[col][sel], categories=self.labels[col])
+            else:
+                data[col] = self.values[col][sel]
+        return pd.DataFrame(data)
+
+    def tail(self, sel, n):
+        """The n latest rows of a selection (rows are stored in date order)."""
+        if isinstance(sel, slice):
+            return slice(max(sel.start, sel.stop - n), sel.stop)
+        return sel[-n:]
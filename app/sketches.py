@@ -0,0 +1,281 @@
+"""
+Approximate analytics for the dashboard (opt-in "approximate mode").
+
+Built once per process from the SharedDataset (see shared_dataset.py) and
+shared by every session:
+
+- HyperLogLog sketches (p=14, ~0.8% relative std. error, Ertl's estimator) for distinct doctors
+  and hospitals, one register array per admission month. A date range
+  merges the whole months it covers and adds the rows of the partial months
+  at its edges (the dashboard counts filtered selections exactly instead,
+  since their rows are gathered anyway).
+- Billing quantile sketches: log-spaced histograms (relative bin width < 1%
+  for typical billing ranges) per admission month x admission type, merged
+  the same way, for the box plot.
+- A stratified Bernoulli sample (strata: admission month x admission type)
+  with Horvitz-Thompson weights, for the KPI sums/means (with 95% confidence
+  intervals) and the distribution charts.
+
+    DASHBOARD_APPROX=1          start sessions with approximate mode switched on
+    APPROX_SAMPLE_RATE=0.01     base sampling rate per stratum
+    APPROX_MIN_STRATUM=100      minimum sampled rows per stratum (rate raised to reach it)
+"""
+
+import os
+import numpy as np
+import pandas as pd
+from shared_dataset import SharedDataset
+
+APPROX_DEFAULT = os.getenv("DASHBOARD_APPROX", "0") == "1"
+SAMPLE_RATE = float(os.getenv("APPROX_SAMPLE_RATE", "0.01"))
+MIN_STRATUM = int(os.getenv("APPROX_MIN_STRATUM", "100"))
+
+HLL_PRECISION = 14
+QUANTILE_BINS = 512
+Z_95 = 1.96
+
+# Distinct-count KPIs served from HyperLogLog sketches
+DISTINCT_KEYS = ["doctor_key", "hospital_key"]
+
+_U64 = np.uint64
+
+
+# -----------------------------------------------------------------------------
+# Hashing
+# -----------------------------------------------------------------------------
+def hash64(values, seed=0):
+    """splitmix64 finalizer over integer values: well-mixed uint64 hashes."""
+    offset = _U64((0x9E3779B97F4A7C15 * (seed + 1)) & 0xFFFFFFFFFFFFFFFF)
+    x = np.asarray(values).astype(np.int64).view(_U64) + offset
+    x = (x ^ (x >> _U64(30))) * _U64(0xBF58476D1CE4E5B9)
+    x = (x ^ (x >> _U64(27))) * _U64(0x94D049BB133111EB)
+    return x ^ (x >> _U64(31))
+
+
+def _bit_length(x):
+    n = np.zeros(x.shape, dtype=np.uint8)
+    x = x.copy()
+    for shift in (32, 16, 8, 4, 2, 1):
+        big = x >= (_U64(1) << _U64(shift))
+        n[big] += shift
+        x[big] >>= _U64(shift)
+    return n + (x > 0)
+
+
+# -----------------------------------------------------------------------------
+# HyperLogLog
+# -----------------------------------------------------------------------------
+def hll_updates(hashes, p=HLL_PRECISION):
+    """(register index, rank) per hash: top p bits pick the register."""
+    bucket = (hashes >> _U64(64 - p)).astype(np.int64)
+    rest = hashes & ((_U64(1) << _U64(64 - p)) - _U64(1))
+    rank = (64 - p) - _bit_length(rest).astype(np.int64) + 1
+    return bucket, rank.astype(np.uint8)
+
+
+def _sigma(x):
+    if x == 1.0:
+        return float("inf")
+    y, z = 1.0, x
+    while True:
+        x *= x
+        z_prev = z
+        z += x * y
+        y += y
+        if z == z_prev:
+            return z
+
+
+def _tau(x):
+    if x == 0.0 or x == 1.0:
+        return 0.0
+    y, z = 1.0, 1.0 - x
+    while True:
+        x = np.sqrt(x)
+        z_prev = z
+        y *= 0.5
+        z -= (1.0 - x) ** 2 * y
+        if z == z_prev:
+            return z / 3
+
+
+def hll_estimate(registers, p=HLL_PRECISION):
+    """Cardinality estimate from one register array.
+
+    Ertl's improved estimator ("New cardinality estimation algorithms for
+    HyperLogLog sketches", 2017): unbiased across the whole range, including
+    the 2.5m-5m band where the classic raw estimate runs high.
+    """
+    m = registers.shape[-1]
+    q = 64 - p
+    hist = np.bincount(registers.astype(np.int64), minlength=q + 2).astype(float)
+    if hist[0] == m:
+        return 0.0
+    z = m * _tau(1.0 - hist[q + 1] / m)
+    for k in range(q, 0, -1):
+        z = 0.5 * (z + hist[k])
+    z += m * _sigma(hist[0] / m)
+    return float(m * m / (2 * np.log(2)) / z)
+
+
+def hll_ci(estimate, p=HLL_PRECISION):
+    """95% half-width of an HLL estimate (relative std. error 1.04 / sqrt(m))."""
+    return Z_95 * 1.04 / np.sqrt(1 << p) * estimate
+
+
+# -----------------------------------------------------------------------------
+# Horvitz-Thompson estimators over the weighted sample
+# -----------------------------------------------------------------------------
+def ht_total(y, w):
+    """Estimated population total and 95% half-width (Poisson sampling, w = 1/pi)."""
+    y = np.nan_to_num(y)
+    return float(np.sum(w * y)), Z_95 * float(np.sqrt(np.sum(w * (w - 1) * y * y)))
+
+
+def ht_ratio(y, w):
+    """Estimated population mean of y (NaN-aware) and 95% half-width (linearized)."""
+    ok = ~np.isnan(y)
+    y, w = y[ok], w[ok]
+    denom = np.sum(w)
+    if denom == 0:
+        return float("nan"), float("nan")
+    r = np.sum(w * y) / denom
+    var = np.sum(w * (w - 1) * (y - r) ** 2) / denom ** 2
+    return float(r), Z_95 * float(np.sqrt(var))
+
+
+# -----------------------------------------------------------------------------
+# Month-partitioned sketches + stratified sample
+# -----------------------------------------------------------------------------
+class ApproxIndex:
+    def __init__(self, ds, sample_rate=SAMPLE_RATE, min_stratum=MIN_STRATUM, p=HLL_PRECISION):
+        self.ds = ds
+        self.p = p
+        # Rows are stored in date order, so month codes are non-decreasing.
+        self.month_codes = ds.codes["admission_month_key"]
+        n_months = len(ds.labels["admission_month_key"])
+        self.month_bounds = np.searchsorted(self.month_codes, np.arange(n_months + 1))
+
+        # HLL: (bucket, rank) per distinct label, rows look them up by code.
+        self._hll_label = {}
+        self._hll_month = {}
+        for key in DISTINCT_KEYS:
+            if key not in ds.codes:
+                continue
+            bucket, rank = hll_updates(hash64(ds.labels[key].to_numpy()), p)
+            self._hll_label[key] = (bucket, rank)
+            codes = ds.codes[key]
+            ok = codes >= 0
+            regs = np.zeros((n_months, 1 << p), dtype=np.uint8)
+            np.maximum.at(regs, (self.month_codes[ok], bucket[codes[ok]]), rank[codes[ok]])
+            self._hll_month[key] = regs
+
+        # Billing quantile sketch: log-spaced bins per month x admission type.
+        billing = ds.values["billing_amount"]
+        positive = billing[billing > 0]
+        lo, hi = (positive.min(), positive.max()) if len(positive) else (1.0, 2.0)
+        self.bin_edges = np.geomspace(lo, max(hi, lo * (1 + 1e-9)), QUANTILE_BINS + 1)
+        self.types = ds.labels["display_type"]
+        type_codes = ds.codes["display_type"]
+        ok = (billing > 0) & (type_codes >= 0)
+        flat = (self.month_codes[ok] * len(self.types) + type_codes[ok]) * QUANTILE_BINS + self._bins(billing[ok])
+        self._quant_month = np.bincount(
+            flat, minlength=n_months * len(self.types) * QUANTILE_BINS
+        ).reshape(n_months, len(self.types), QUANTILE_BINS)
+
+        self.sample = self._stratified_sample(sample_rate, min_stratum)
+        self.sample_fraction = self.sample.n_rows / max(ds.n_rows, 1)
+
+    # -------------------------------------------------------------------------
+    # Helpers
+    # -------------------------------------------------------------------------
+    def _bins(self, values):
+        return np.clip(np.searchsorted(self.bin_edges, values, side="right") - 1, 0, QUANTILE_BINS - 1)
+
+    def _split(self, sel):
+        """Whole months covered by a slice selection, plus the partial-month edge slices."""
+        if not isinstance(sel, slice) or sel.start >= sel.stop:
+            return slice(0, 0), [sel]
+        lo, hi = sel.start, sel.stop
+        m_lo, m_hi = self.month_codes[lo], self.month_codes[hi - 1]
+        first = m_lo if self.month_bounds[m_lo] == lo else m_lo + 1
+        last = m_hi + 1 if self.month_bounds[m_hi + 1] == hi else m_hi
+        if first >= last:
+            return slice(0, 0), [sel]
+        return slice(first, last), [slice(lo, self.month_bounds[first]), slice(self.month_bounds[last], hi)]
+
+    def _stratified_sample(self, rate, min_stratum):
+        ds = self.ds
+        strata = self.month_codes.astype(np.int64) * (len(self.types) + 1) + (ds.codes["display_type"] + 1)
+        _, inverse, sizes = np.unique(strata, return_inverse=True, return_counts=True)
+        # Per-stratum inclusion probability, raised for small strata.
+        pi = np.minimum(1.0, np.maximum(rate, min_stratum / sizes))[inverse]
+        # Hash of the admission key: the same rows are sampled on every reload.
+        ids = ds.values["admission_key"] if "admission_key" in ds.values else np.arange(ds.n_rows)
+        u = (hash64(ids, seed=1) >> _U64(11)).astype(np.float64) / float(1 << 53)
+        idx = np.flatnonzero(u < pi)
+
+        frame = ds.take(idx)
+        weight = 1.0 / pi[idx]
+        frame["weight"] = weight
+        frame["w_billing"] = weight * frame["billing_amount"].to_numpy(dtype=float)
+        los = frame["los_days"].to_numpy(dtype=float)
+        frame["w_los"] = np.where(np.isnan(los), 0.0, weight * los)
+        frame["w_los_n"] = np.where(np.isnan(los), 0.0, weight)
+        return SharedDataset(frame, date_col=ds.date_col)
+
+    # -------------------------------------------------------------------------
+    # Estimates over a full-dataset selection
+    # -------------------------------------------------------------------------
+    def distinct(self, key, sel):
+        """HLL estimate of distinct `key` values in `sel`, with 95% half-width."""
+        months, edges = self._split(sel)
+        regs = self._hll_month[key][months].max(axis=0, initial=0)
+        bucket, rank = self._hll_label[key]
+        for part in edges:
+            codes = self.ds.codes[key][part]
+            codes = codes[codes >= 0]
+            np.maximum.at(regs, bucket[codes], rank[codes])
+        est = hll_estimate(regs, self.p)
+        return est, hll_ci(est, self.p)
+
+    def billing_box(self, sel):
+        """Box-plot statistics (from the quantile sketch) per admission type."""
+        months, edges = self._split(sel)
+        counts = self._quant_month[months].sum(axis=0)
+        for part in edges:
+            vals = self.ds.values["billing_amount"][part]
+            types = self.ds.codes["display_type"][part]
+            ok = (vals > 0) & (types >= 0)
+            counts += np.bincount(
+                types[ok] * QUANTILE_BINS + self._bins(vals[ok]), minlength=counts.size
+            ).reshape(counts.shape)
+
+        rows = []
+        for t, label in enumerate(self.types):
+            if counts[t].sum() == 0:
+                continue
+            q1, med, q3 = self._quantiles(counts[t], [0.25, 0.5, 0.75])
+            nz = np.flatnonzero(counts[t])
+            low, high = self.bin_edges[nz[0]], self.bin_edges[nz[-1] + 1]
+            iqr = q3 - q1
+            rows.append({
+                "display_type": label,
+                "q1": q1, "median": med, "q3": q3,
+                "lowerfence": max(low, q1 - 1.5 * iqr),
+                "upperfence": min(high, q3 + 1.5 * iqr),
+                "count": int(counts[t].sum()),
+            })
+        return pd.DataFrame(rows)
+
+    def _quantiles(self, counts, qs):
+        cum = np.cumsum(counts)
+        out = []
+        for q in qs:
+            target = q * cum[-1]
+            i = min(int(np.searchsorted(cum, target)), len(counts) - 1)
+            before = cum[i - 1] if i else 0
+            frac = (target - before) / counts[i] if counts[i] else 0.0
+            # Geometric interpolation inside the log-spaced bin
+            out.append(float(self.bin_edges[i] * (self.bin_edges[i + 1] / self.bin_edges[i]) ** frac))
+        return out
@@ -0,0 +1,76 @@
+"""
+Unit tests for shared_dataset.py: selections and aggregates against pandas.
+
+    cd app && python -m pytest -q test_shared_dataset.py
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+from shared_dataset import SharedDataset
+
+
+@pytest.fixture(scope="module")
+def frame():
+    rng = np.random.default_rng(1)
+    n = 5_000
+    return pd.DataFrame({
+        "admission_date": pd.Timestamp("2023-01-01") + pd.to_timedelta(rng.integers(0, 90, n), unit="D"),
+        "display_hospital": rng.choice(["A", "B", "C", None], n),
+        "display_type": pd.Categorical(rng.choice(["Elective", "Emergency", "Urgent"], n)),
+        "medical_condition": rng.choice(["Asthma", "Cancer", "Diabetes"], n),
+        "doctor_key": rng.integers(0, 300, n),
+        "billing_amount": rng.uniform(100, 1_000, n),
+        "los_days": pd.array(np.where(rng.random(n) < 0.1, None, rng.integers(1, 20, n)), dtype="Int64"),
+    })
+
+
+@pytest.fixture(scope="module")
+def ds(frame):
+    return SharedDataset(frame)
+
+
+def expected(frame, start, end, **filters):
+    mask = frame["admission_date"].between(pd.Timestamp(start), pd.Timestamp(end))
+    for col, chosen in filters.items():
+        mask &= frame[col].isin(chosen)
+    return frame[mask]
+
+
+def test_date_only_selection_is_a_slice(ds, frame):
+    sel = ds.select("2023-02-01", "2023-02-28")
+    assert isinstance(sel, slice)
+    assert ds.size(sel) == len(expected(frame, "2023-02-01", "2023-02-28"))
+
+
+def test_filtered_selection_matches_pandas(ds, frame):
+    filters = {"display_hospital": ["A", "C"], "display_type": ["Urgent"]}
+    sel = ds.select("2023-01-10", "2023-03-05", **filters)
+    want = expected(frame, "2023-01-10", "2023-03-05", **filters)
+    assert ds.size(sel) == len(want)
+    assert ds.sum("billing_amount", sel) == pytest.approx(want["billing_amount"].sum())
+    assert ds.mean("los_days", sel) == pytest.approx(want["los_days"].mean())
+    assert ds.nunique("doctor_key", sel) == want["doctor_key"].nunique()
+
+
+def test_group_aggregates_match_pandas(ds, frame):
+    sel = ds.select("2023-01-01", "2023-03-31")
+    want = expected(frame, "2023-01-01", "2023-03-31")
+
+    counts = ds.group_count("display_hospital", sel)
+    pd.testing.assert_series_equal(
+        counts.sort_index(), want["display_hospital"].value_counts().sort_index(),
+        check_names=False, check_index_type=False, check_dtype=False,
+    )
+    sums = ds.group_sum("medical_condition", "billing_amount", sel)
+    np.testing.assert_allclose(sums.sort_index().values, want.groupby("medical_condition")["billing_amount"].sum().values)
+
+    cross = ds.cross_count("display_type", "medical_condition", sel)
+    assert cross["count"].sum() == len(want)
+
+
+def test_arrays_are_read_only(ds):
+    with pytest.raises(ValueError):
+        ds.values["billing_amount"][0] = 0.0
+    with pytest.raises(ValueError):
+        ds.codes["display_type"][0] = 0
@@ -0,0 +1,128 @@
+"""
+Unit tests for sketches.py (pure numpy/pandas, no database needed).
+
+    cd app && python -m pytest -q test_sketches.py test_shared_dataset.py
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+from shared_dataset import SharedDataset
+from sketches import DISTINCT_KEYS, ApproxIndex, HLL_PRECISION, hash64, hll_ci, hll_estimate, hll_updates, ht_ratio, ht_total
+
+M = 1 << HLL_PRECISION
+
+
+def sketch(keys):
+    bucket, rank = hll_updates(hash64(keys))
+    registers = np.zeros(M, dtype=np.uint8)
+    np.maximum.at(registers, bucket, rank)
+    return registers
+
+
+def test_hll_empty_sketch_is_zero():
+    assert hll_estimate(np.zeros(M, dtype=np.uint8)) == 0.0
+
+
+@pytest.mark.parametrize("n", [100, 5_000])
+def test_hll_small_range(n):
+    est = hll_estimate(sketch(np.arange(n)))
+    assert abs(est - n) <= hll_ci(est)
+
+
+@pytest.mark.parametrize("n", [int(2.5 * M), int(3.5 * M), 5 * M])
+def test_hll_unbiased_with_ci_coverage_between_2_5m_and_5m(n):
+    # The classic raw estimator runs ~+1.6% high in this band; Ertl's does not.
+    trials = 40
+    errors, covered = [], 0
+    for t in range(trials):
+        keys = np.arange(n, dtype=np.int64) + t * 10_000_000_000
+        est = hll_estimate(sketch(keys))
+        errors.append(est / n - 1)
+        covered += abs(est - n) <= hll_ci(est)
+    assert abs(np.mean(errors)) < 0.005
+    assert covered / trials >= 0.85
+
+
+def test_hll_ignores_duplicates():
+    keys = np.arange(20_000)
+    np.testing.assert_array_equal(sketch(keys), sketch(np.concatenate([keys, keys[::-1]])))
+
+
+def test_ht_estimators_exact_on_full_sample():
+    y = np.array([1.0, 2.0, np.nan, 4.0])
+    w = np.ones_like(y)
+    assert ht_total(y, w) == (7.0, 0.0)
+    mean, ci = ht_ratio(y, w)
+    assert mean == pytest.approx(7 / 3)
+    assert ci == 0.0
+
+
+# -----------------------------------------------------------------------------
+# ApproxIndex over a SharedDataset
+# -----------------------------------------------------------------------------
+@pytest.fixture(scope="module")
+def dataset():
+    rng = np.random.default_rng(0)
+    n = 60_000
+    dates = pd.Timestamp("2022-01-01") + pd.to_timedelta(rng.integers(0, 365, n), unit="D")
+    frame = pd.DataFrame({
+        "admission_key": np.arange(n),
+        "admission_date": dates,
+        "admission_month_key": (dates.year * 100 + dates.month).to_numpy(),
+        "display_type": rng.choice(["Elective", "Emergency", "Urgent"], n),
+        "billing_amount": rng.uniform(1_000, 50_000, n),
+        "los_days": rng.integers(1, 30, n).astype(float),
+        "doctor_key": rng.integers(0, 20_000, n),
+        "hospital_key": rng.integers(0, 5_000, n),
+        "patient_key": rng.integers(0, 50_000, n),
+    })
+    return SharedDataset(frame)
+
+
+@pytest.fixture(scope="module")
+def approx(dataset):
+    return ApproxIndex(dataset, sample_rate=0.05, min_stratum=50)
+
+
+def test_distinct_month_merge_matches_row_sketch(dataset, approx):
+    # Mid-month to mid-month: whole months from the stored sketches, edges from rows.
+    sel = dataset.select("2022-02-15", "2022-09-10")
+    est, _ = approx.distinct("doctor_key", sel)
+    keys = dataset.labels["doctor_key"].to_numpy()[dataset.codes["doctor_key"][sel]]
+    assert est == pytest.approx(hll_estimate(sketch(keys)))
+
+
+def test_distinct_within_ci_of_exact(dataset, approx):
+    sel = dataset.select("2022-01-01", "2022-12-31")
+    for key in DISTINCT_KEYS:
+        est, ci = approx.distinct(key, sel)
+        assert abs(est - dataset.nunique(key, sel)) <= ci
+
+
+def test_billing_box_quartiles_close_to_exact(dataset, approx):
+    sel = dataset.select("2022-03-01", "2022-06-20")
+    box = approx.billing_box(sel).set_index("display_type")
+    rows = dataset.take(sel, ["display_type", "billing_amount"])
+    for label, group in rows.groupby("display_type", observed=True):
+        q1, med, q3 = np.quantile(group["billing_amount"], [0.25, 0.5, 0.75])
+        assert box.loc[label, "q1"] == pytest.approx(q1, rel=0.01)
+        assert box.loc[label, "median"] == pytest.approx(med, rel=0.01)
+        assert box.loc[label, "q3"] == pytest.approx(q3, rel=0.01)
+
+
+def test_sample_estimates_cover_exact_totals(dataset, approx):
+    sample = approx.sample
+    sel, vsel = dataset.select("2022-01-01", "2022-12-31"), sample.select("2022-01-01", "2022-12-31")
+    weights = sample.values["weight"][vsel]
+
+    revenue, revenue_ci = ht_total(sample.values["billing_amount"][vsel], weights)
+    assert abs(revenue - dataset.sum("billing_amount", sel)) <= revenue_ci
+
+    los, los_ci = ht_ratio(sample.values["los_days"][vsel], weights)
+    assert abs(los - dataset.mean("los_days", sel)) <= los_ci
+
+
+def test_sample_is_deterministic(dataset, approx):
+    again = ApproxIndex(dataset, sample_rate=0.05, min_stratum=50)
+    np.testing.assert_array_equal(approx.sample.values["admission_key"], again.sample.values["admission_key"])
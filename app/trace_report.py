@@ -0,0 +1,53 @@
+"""
+Aggregate the dashboard's JSONL rerun trace (DASHBOARD_TRACE_PATH, see perf.py).
+
+    python trace_report.py traces/dashboard_trace.jsonl [--top 20] [--since 2026-01-01]
+
+Prints p50 / p95 / p99 / max per section across all recorded reruns, sorted
+by p95, plus the rerun totals and the cache hit rate per cached function.
+"""
+
+import argparse
+import pandas as pd
+
+
+def load_trace(path, since=None):
+    records = pd.read_json(path, lines=True)
+    if since:
+        records = records[pd.to_datetime(records["ts"]) >= pd.Timestamp(since, tz="UTC")]
+    return records
+
+
+def section_percentiles(records):
+    sections = pd.json_normalize(records["sections"].tolist())
+    sections["rerun_total"] = records["total_ms"].values
+    stats = sections.describe(percentiles=[0.5, 0.95, 0.99]).T
+    stats = stats.rename(columns={"50%": "p50_ms", "95%": "p95_ms", "99%": "p99_ms", "max": "max_ms"})
+    return stats[["count", "p50_ms", "p95_ms", "p99_ms", "max_ms"]].sort_values("p95_ms", ascending=False)
+
+
+def cache_hit_rates(records):
+    cache = pd.json_normalize(records["cache"].tolist())
+    return (cache == "hit").sum() / cache.notna().sum()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("path", help="JSONL trace written by the dashboard")
+    parser.add_argument("--top", type=int, default=20, help="sections to show (default: 20)")
+    parser.add_argument("--since", help="only reruns at or after this ISO date/time (UTC)")
+    args = parser.parse_args()
+
+    records = load_trace(args.path, args.since)
+    if records.empty:
+        print("No reruns recorded.")
+        return
+
+    print(f"📊 {len(records):,} reruns from {records['session_id'].nunique():,} sessions\n")
+    print(section_percentiles(records).head(args.top).round(1).to_string())
+    print("\n🗄️  Cache hit rate")
+    print(cache_hit_rates(records).round(3).to_string())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,12 @@
+{#
+    True when sql/migrations/002_fold_test_result.sql has been applied, i.e.
+    the test result lives on admission.test_result instead of the separate
+    1:1 test_result table. Only evaluated at run time (not during parsing).
+#}
+{% macro test_result_folded() %}
+    {% if execute %}
+        {% set columns = adapter.get_columns_in_relation(source('healthcare', 'admission')) %}
+        {{ return('test_result' in columns | map(attribute='name') | list) }}
+    {% endif %}
+    {{ return(false) }}
+{% endmacro %}
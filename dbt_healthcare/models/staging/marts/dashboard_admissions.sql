@@ -0,0 +1,62 @@
+{{ config(
+    materialized='table',
+    indexes=[
+      {'columns': ['admission_date']},
+      {'columns': ['admission_date_key']},
+      {'columns': ['admission_key'], 'unique': True},
+      {'columns': ['display_hospital']},
+      {'columns': ['display_doctor']}
+    ]
+) }}
+
+-- One wide, typed row per admission in the exact shape the Streamlit
+-- dashboard consumes. All renaming, defaulting and derived columns live
+-- here so app.py can read the table as-is.
+
+with f as (
+    select * from {{ ref('fact_admissions') }}
+)
+
+select
+    f.admission_key,
+    f.patient_key,
+    f.doctor_key,
+    f.hospital_key,
+    f.insurer_key,
+    f.condition_key,
+    f.admission_date_key,
+    f.discharge_date_key,
+    ad.full_date                                                as admission_date,
+    dd.full_date                                                as discharge_date,
+    (dd.full_date - ad.full_date)                               as los_days,
+    ad.month_key                                                as admission_month_key,
+    ad.month_start                                              as admission_month,
+    ad.weekday                                                  as day_of_week_num,
+    ad.weekday_name                                             as day_of_week,
+    ad.is_weekend,
+    coalesce(h.hospital_name, 'Hospital ' || f.hospital_key)    as display_hospital,
+    coalesce(d.doctor_name, 'Dr. ' || f.doctor_key)             as display_doctor,
+    coalesce(nullif(f.admission_type, ''), 'Standard')          as display_type,
+    coalesce(i.provider_name, 'Unknown')                        as insurance_provider,
+    coalesce(c.condition_name, 'Unknown')                       as medical_condition,
+    f.tr                                                        as test_result,
+    f.room_number,
+    f.billing_amount::double precision                          as billing_amount,
+    p.age::smallint                                             as age,
+    p.gender,
+    p.blood_type
+from f
+join {{ ref('dim_date') }} ad
+    on f.admission_date_key = ad.date_key
+left join {{ ref('dim_date') }} dd
+    on f.discharge_date_key = dd.date_key
+left join {{ ref('dim_hospital') }} h
+    on f.hospital_key = h.hospital_key
+left join {{ ref('dim_doctor') }} d
+    on f.doctor_key = d.doctor_key
+left join {{ ref('dim_patient') }} p
+    on f.patient_key = p.patient_key
+left join {{ ref('dim_insurer') }} i
+    on f.insurer_key = i.insurer_key
+left join {{ ref('dim_medical_condition') }} c
+    on f.condition_key = c.condition_key
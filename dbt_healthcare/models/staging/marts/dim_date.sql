@@ -0,0 +1,38 @@
+{{ config(
+    materialized='table',
+    indexes=[
+      {'columns': ['date_key'], 'unique': True},
+      {'columns': ['month_key']}
+    ]
+) }}
+
+-- Calendar dimension covering every admission and discharge date.
+-- date_key is the integer YYYYMMDD used by fact_admissions.
+
+with bounds as (
+    select
+        least(min(date_of_admission::date), min(discharge_date::date))       as min_date,
+        greatest(max(date_of_admission::date), max(discharge_date::date))    as max_date
+    from {{ ref('stg_admission') }}
+),
+
+spine as (
+    select generate_series(min_date, max_date, interval '1 day')::date as full_date
+    from bounds
+)
+
+select
+    to_char(full_date, 'YYYYMMDD')::int                 as date_key,
+    full_date,
+    extract(day from full_date)::smallint               as day,
+    extract(week from full_date)::smallint              as week,
+    extract(month from full_date)::smallint             as month,
+    trim(to_char(full_date, 'Month'))                   as month_name,
+    to_char(full_date, 'YYYYMM')::int                   as month_key,
+    date_trunc('month', full_date)::date                as month_start,
+    extract(quarter from full_date)::smallint           as quarter,
+    extract(year from full_date)::smallint              as year,
+    extract(isodow from full_date)::smallint            as weekday,
+    trim(to_char(full_date, 'Day'))                     as weekday_name,
+    extract(isodow from full_date) in (6, 7)            as is_weekend
+from spine
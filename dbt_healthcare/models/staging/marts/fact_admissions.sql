@@ -1,3 +1,14 @@
+{{ config(
+    materialized='table',
+    indexes=[
+      {'columns': ['admission_key'], 'unique': True},
+      {'columns': ['admission_date_key']}
+    ]
+) }}
+
+-- Materialized as a table (not a staging view): PostgreSQL only allows
+-- TABLESAMPLE on tables, which the approximate Q3/Q4 in app/queries.py use.
+
 with base as (
     select
         a.admission_id                          as admission_key,
@@ -8,13 +19,20 @@ with base as (
         a.condition_id                          as condition_key,
         a.date_of_admission,
         a.discharge_date,
+        to_char(a.date_of_admission, 'YYYYMMDD')::int   as admission_date_key,
+        to_char(a.discharge_date, 'YYYYMMDD')::int      as discharge_date_key,
         a.room_number,
         a.admission_type,
         a.billing_amount,
+    {% if test_result_folded() %}
+        a.test_result                             as tr
+    from {{ ref('stg_admission') }} a
+    {% else %}
         test_result                               as tr
     from {{ ref('stg_admission') }} a
     left join {{ ref('stg_test_result') }} tr
         on a.admission_id = tr.admission_id
+    {% endif %}
 )
 
 select * from base
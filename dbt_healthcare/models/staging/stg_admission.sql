@@ -9,7 +9,10 @@ with src as (
         date_of_admission,
         discharge_date,
         room_number,
-        admission_type,
+        admission_type::text as admission_type,
+        {% if test_result_folded() -%}
+        test_result::text    as test_result,
+        {% endif -%}
         billing_amount
     from {{ source('healthcare', 'admission') }}
 )
@@ -3,8 +3,8 @@ with src as (
         patient_id,
         name,
         age,
-        gender,
-        blood_type
+        gender::text     as gender,
+        blood_type::text as blood_type
     from {{ source('healthcare', 'patient') }}
 )
 
@@ -5,7 +5,7 @@ with src as (
     select
         test_result_id,
         admission_id,
-        test_result
+        test_result::text as test_result
     from {{ source('healthcare', 'test_result') }}
 
 )
@@ -0,0 +1,114 @@
+"""
+Generate a synthetic healthcare CSV in the same layout as Data/healthcare_dataset.csv.
+
+    python generate_synthetic_data.py --rows 1000000 --out Data/synthetic_1m.csv
+    python ingest_data.py --csv Data/synthetic_1m.csv
+
+Column names, label sets and value ranges follow the Kaggle dataset so the
+file goes through ingest_data.py and dbt unchanged; use it to load a local
+Postgres at a chosen scale for benchmarks and load tests (app/loadtest.py).
+The same --seed always produces the same file.
+"""
+
+import argparse
+import os
+import numpy as np
+import pandas as pd
+
+FIRST_NAMES = [
+    "James", "Mary", "Robert", "Patricia", "John", "Jennifer", "Michael", "Linda",
+    "David", "Elizabeth", "William", "Barbara", "Richard", "Susan", "Joseph", "Jessica",
+    "Thomas", "Sarah", "Charles", "Karen", "Daniel", "Lisa", "Matthew", "Nancy",
+]
+LAST_NAMES = [
+    "Smith", "Johnson", "Williams", "Brown", "Jones", "Garcia", "Miller", "Davis",
+    "Rodriguez", "Martinez", "Hernandez", "Lopez", "Gonzalez", "Wilson", "Anderson",
+    "Thomas", "Taylor", "Moore", "Jackson", "Martin", "Lee", "Perez", "Thompson", "White",
+]
+HOSPITAL_SUFFIXES = ["Hospital", "Medical Center", "and Sons", "Group", "Ltd", "Inc", "LLC", "PLC"]
+
+# Label sets must match the enum types in schema.sql
+GENDERS = ["Male", "Female"]
+BLOOD_TYPES = ["A+", "A-", "B+", "B-", "AB+", "AB-", "O+", "O-"]
+ADMISSION_TYPES = ["Emergency", "Elective", "Urgent"]
+TEST_RESULTS = ["Normal", "Abnormal", "Inconclusive"]
+CONDITIONS = ["Cancer", "Obesity", "Diabetes", "Asthma", "Hypertension", "Arthritis"]
+INSURERS = ["Aetna", "Blue Cross", "Cigna", "UnitedHealthcare", "Medicare"]
+MEDICATIONS = ["Paracetamol", "Ibuprofen", "Aspirin", "Penicillin", "Lipitor"]
+
+START_DATE = pd.Timestamp("2019-05-08")
+END_DATE = pd.Timestamp("2024-05-07")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100_000, help="admissions to generate (default: 100000)")
+    parser.add_argument("--out", default="Data/synthetic_healthcare.csv", help="output CSV path")
+    parser.add_argument("--doctors", type=int, help="distinct doctors (default: rows / 2)")
+    parser.add_argument("--hospitals", type=int, help="distinct hospitals (default: rows / 2)")
+    parser.add_argument("--patients", type=int, help="distinct patients (default: rows)")
+    parser.add_argument("--seed", type=int, default=42)
+    return parser.parse_args()
+
+
+def full_names(rng, n):
+    return pd.Series(rng.choice(FIRST_NAMES, n)) + " " + pd.Series(rng.choice(LAST_NAMES, n))
+
+
+def numbered(prefix_names, n):
+    """Unique labels: a name pool suffixed with a number once the pool runs out."""
+    return [f"{prefix_names[i % len(prefix_names)]} {i // len(prefix_names) + 1}" for i in range(n)]
+
+
+def generate(rows, n_doctors, n_hospitals, n_patients, seed):
+    rng = np.random.default_rng(seed)
+
+    # --- Entity pools ---
+    patient_names = full_names(rng, n_patients)
+    patient_age = rng.integers(13, 90, n_patients)
+    patient_gender = rng.choice(GENDERS, n_patients)
+    patient_blood = rng.choice(BLOOD_TYPES, n_patients)
+    doctors = numbered([f"Dr. {a} {b}" for a in FIRST_NAMES for b in LAST_NAMES], n_doctors)
+    hospitals = numbered([f"{b} {s}" for b in LAST_NAMES for s in HOSPITAL_SUFFIXES], n_hospitals)
+
+    # --- Admissions ---
+    patient = rng.integers(0, n_patients, rows)
+    admitted = START_DATE + pd.to_timedelta(rng.integers(0, (END_DATE - START_DATE).days + 1, rows), unit="D")
+    discharged = admitted + pd.to_timedelta(rng.integers(1, 31, rows), unit="D")
+
+    return pd.DataFrame({
+        "Name": patient_names.to_numpy()[patient],
+        "Age": patient_age[patient],
+        "Gender": patient_gender[patient],
+        "Blood Type": patient_blood[patient],
+        "Medical Condition": rng.choice(CONDITIONS, rows),
+        "Date of Admission": admitted.strftime("%Y-%m-%d"),
+        "Doctor": np.asarray(doctors)[rng.integers(0, n_doctors, rows)],
+        "Hospital": np.asarray(hospitals)[rng.integers(0, n_hospitals, rows)],
+        "Insurance Provider": rng.choice(INSURERS, rows),
+        "Billing Amount": rng.uniform(1_000, 52_000, rows).round(2),
+        "Room Number": rng.integers(101, 501, rows),
+        "Admission Type": rng.choice(ADMISSION_TYPES, rows),
+        "Discharge Date": discharged.strftime("%Y-%m-%d"),
+        "Medication": rng.choice(MEDICATIONS, rows),
+        "Test Results": rng.choice(TEST_RESULTS, rows),
+    })
+
+
+def main():
+    args = parse_args()
+    n_doctors = args.doctors or max(1, args.rows // 2)
+    n_hospitals = args.hospitals or max(1, args.rows // 2)
+    n_patients = args.patients or args.rows
+
+    print(f"🧪 Generating {args.rows:,} admissions "
+          f"({n_patients:,} patients, {n_doctors:,} doctors, {n_hospitals:,} hospitals) ...")
+    df = generate(args.rows, n_doctors, n_hospitals, n_patients, args.seed)
+
+    os.makedirs(os.path.dirname(os.path.abspath(args.out)), exist_ok=True)
+    df.to_csv(args.out, index=False)
+    print(f"💾 Written to {args.out} ({os.path.getsize(args.out) / 1024 / 1024:,.1f} MB)")
+
+
+if __name__ == "__main__":
+    main()
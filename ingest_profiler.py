@@ -0,0 +1,204 @@
+"""
+Stage-level instrumentation for ingest_data.py (--profile).
+
+Each `with profiler.stage(name):` block records wall time, CPU time, RSS at
+the start and end of the stage (/proc/self/statm), how far the stage pushed
+the process's peak RSS up (resource module) and, optionally, the tracemalloc
+peak for that stage, plus
+rows in / rows out and rows/sec. The run is written as one JSON report so
+successive loads can be compared; it names the hottest leaf stage.
+cProfile only ever runs on one named stage (cprofile_stage), so it does
+not inflate the other stages' timings; that stage's stats are dumped next
+to the report (open with `python -m pstats` or snakeviz).
+When the profiler is disabled every stage is a no-op.
+"""
+
+import cProfile
+import io
+import json
+import os
+import platform
+import pstats
+import subprocess
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+try:
+    import resource  # Unix only
+except ImportError:
+    resource = None
+
+
+def peak_rss_mb():
+    """Peak resident set size of this process so far, in MB (None if unavailable)."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is KB on Linux, bytes on macOS
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def rss_mb():
+    """Current resident set size in MB (Linux /proc; None elsewhere)."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def _round(value, digits=1):
+    return None if value is None else round(value, digits)
+
+
+def git_commit():
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], stderr=subprocess.DEVNULL, text=True
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+class StageRecord:
+    """Measurements for one stage; callers set rows_in / rows_out inside the block."""
+
+    def __init__(self, name, rows_in=None, leaf=True):
+        self.name = name
+        self.leaf = leaf
+        self.rows_in = rows_in
+        self.rows_out = None
+        self.wall_s = None
+        self.cpu_s = None
+        self.peak_rss_mb = None
+        self.peak_rss_growth_mb = None
+        self.rss_start_mb = None
+        self.rss_end_mb = None
+        self.tracemalloc_peak_mb = None
+        self.profile = None
+
+    def to_dict(self):
+        rows = self.rows_out if self.rows_out is not None else self.rows_in
+        return {
+            "stage": self.name,
+            "wall_s": round(self.wall_s, 6),
+            "cpu_s": round(self.cpu_s, 6),
+            "rss_start_mb": _round(self.rss_start_mb),
+            "rss_end_mb": _round(self.rss_end_mb),
+            "rss_delta_mb": (
+                None if self.rss_start_mb is None or self.rss_end_mb is None
+                else round(self.rss_end_mb - self.rss_start_mb, 1)
+            ),
+            # ru_maxrss is a process-wide high-water mark: only the stage that
+            # raised it shows growth here; peak_rss_mb is the mark after the stage.
+            "peak_rss_growth_mb": _round(self.peak_rss_growth_mb),
+            "peak_rss_mb": _round(self.peak_rss_mb),
+            "tracemalloc_peak_mb": _round(self.tracemalloc_peak_mb),
+            "rows_in": self.rows_in,
+            "rows_out": self.rows_out,
+            "rows_per_sec": round(rows / self.wall_s, 1) if rows and self.wall_s else None,
+        }
+
+
+class IngestProfiler:
+    def __init__(self, enabled=False, trace_malloc=False, cprofile_stage=None):
+        self.enabled = enabled
+        self.trace_malloc = enabled and trace_malloc
+        self.cprofile_stage = cprofile_stage if enabled else None
+        self.stages = []
+        self.started_at = datetime.now(timezone.utc)
+        self._t0 = time.perf_counter()
+        self._cpu0 = time.process_time()
+        if self.trace_malloc:
+            tracemalloc.start()
+
+    @contextmanager
+    def stage(self, name, rows_in=None, leaf=True):
+        """Time one stage. Pass leaf=False for stages that enclose other stages:
+        they skip the tracemalloc peak, which the inner stages reset."""
+        record = StageRecord(name, rows_in, leaf)
+        if not self.enabled:
+            yield record
+            return
+
+        if self.trace_malloc and leaf:
+            tracemalloc.reset_peak()
+        profile = cProfile.Profile() if name == self.cprofile_stage else None
+        record.rss_start_mb = rss_mb()
+        peak0 = peak_rss_mb()
+        wall0, cpu0 = time.perf_counter(), time.process_time()
+        if profile:
+            profile.enable()
+        try:
+            yield record
+        finally:
+            if profile:
+                profile.disable()
+            record.wall_s = time.perf_counter() - wall0
+            record.cpu_s = time.process_time() - cpu0
+            record.rss_end_mb = rss_mb()
+            record.peak_rss_mb = peak_rss_mb()
+            if peak0 is not None:
+                record.peak_rss_growth_mb = record.peak_rss_mb - peak0
+            if self.trace_malloc and leaf:
+                record.tracemalloc_peak_mb = tracemalloc.get_traced_memory()[1] / (1024 * 1024)
+            record.profile = profile
+            self.stages.append(record)
+            rss = "" if record.rss_end_mb is None else f", RSS {record.rss_start_mb:.0f} → {record.rss_end_mb:.0f} MB"
+            print(f"⏱️  {name}: {record.wall_s:.3f}s wall, {record.cpu_s:.3f}s cpu{rss}")
+
+    def report(self, **meta):
+        return {
+            "run": {
+                "started_at": self.started_at.isoformat(),
+                "git_commit": git_commit(),
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "argv": sys.argv[1:],
+                "trace_malloc": self.trace_malloc,
+                "cprofile_stage": self.cprofile_stage,
+                **meta,
+            },
+            "totals": {
+                "wall_s": round(time.perf_counter() - self._t0, 6),
+                "cpu_s": round(time.process_time() - self._cpu0, 6),
+                "peak_rss_mb": None if peak_rss_mb() is None else round(peak_rss_mb(), 1),
+            },
+            "stages": [s.to_dict() for s in self.stages],
+        }
+
+    def hottest(self):
+        """The leaf stage with the longest wall time (None before any stage ran)."""
+        leaves = [s for s in self.stages if s.leaf]
+        return max(leaves, key=lambda s: s.wall_s) if leaves else None
+
+    def write(self, path, **meta):
+        """Write the JSON report (and the profiled stage's .prof) and return the report."""
+        if not self.enabled:
+            return None
+        report = self.report(**meta)
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+
+        hottest = self.hottest()
+        if hottest is not None:
+            report["hottest_stage"] = {"stage": hottest.name, "wall_s": round(hottest.wall_s, 6)}
+
+        for record in self.stages:
+            if record.profile is None:
+                continue
+            prof_path = os.path.splitext(path)[0] + f".{record.name}.prof"
+            record.profile.dump_stats(prof_path)
+            report["cprofile"] = {"stage": record.name, "cprofile_dump": prof_path}
+
+            out = io.StringIO()
+            pstats.Stats(record.profile, stream=out).sort_stats("cumulative").print_stats(15)
+            print(f"🔥 cProfile of stage '{record.name}' (top 15 by cumulative time):")
+            print(out.getvalue())
+
+        with open(path, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"📝 Profile report written to {path}")
+        return report
@@ -1,4 +1,24 @@
 -- Drop tables in FK-safe order
+-- (test_result is a view once sql/migrations/002_fold_test_result.sql has been applied)
+DO $$
+BEGIN
+    IF EXISTS (SELECT 1 FROM pg_views WHERE schemaname = 'public' AND viewname = 'test_result') THEN
+        DROP VIEW test_result CASCADE;  -- also drops dbt views built on it
+    END IF;
+END
+$$;
+-- Real-time aggregates (sql/migrations/003_realtime_aggregates.sql): their
+-- triggers go with admission, so drop the summary tables and functions too
+-- instead of leaving totals that silently stop updating. Re-apply 003 after
+-- a reset.
+DROP FUNCTION IF EXISTS admission_agg_reconcile() CASCADE;
+DROP FUNCTION IF EXISTS admission_agg_rebuild() CASCADE;
+DROP FUNCTION IF EXISTS admission_agg_trigger() CASCADE;
+DROP FUNCTION IF EXISTS admission_agg_truncate() CASCADE;
+DROP TABLE IF EXISTS agg_hospital_daily CASCADE;  -- also drops admission_agg_expected_hospital()
+DROP TABLE IF EXISTS agg_insurer_daily CASCADE;   -- also drops admission_agg_expected_insurer()
+DROP TYPE IF EXISTS admission_agg_delta CASCADE;  -- also drops admission_agg_apply()
+
 DROP TABLE IF EXISTS test_result CASCADE;
 DROP TABLE IF EXISTS admission CASCADE;
 DROP TABLE IF EXISTS medication CASCADE;
@@ -8,6 +28,21 @@ DROP TABLE IF EXISTS hospital CASCADE;
 DROP TABLE IF EXISTS doctor CASCADE;
 DROP TABLE IF EXISTS patient CASCADE;
 
+DROP TYPE IF EXISTS gender_enum;
+DROP TYPE IF EXISTS blood_type_enum;
+DROP TYPE IF EXISTS admission_type_enum;
+DROP TYPE IF EXISTS test_result_enum;
+
+-- =========================
+-- Low-cardinality value types
+-- =========================
+-- Stored as 4-byte enum OIDs instead of repeating the label text on every row.
+
+CREATE TYPE gender_enum         AS ENUM ('Male', 'Female', 'Other');
+CREATE TYPE blood_type_enum     AS ENUM ('A+', 'A-', 'B+', 'B-', 'AB+', 'AB-', 'O+', 'O-');
+CREATE TYPE admission_type_enum AS ENUM ('Emergency', 'Elective', 'Urgent', 'Routine');
+CREATE TYPE test_result_enum    AS ENUM ('Normal', 'Abnormal', 'Inconclusive');
+
 -- =========================
 -- Dimension tables
 -- =========================
@@ -17,8 +52,8 @@ CREATE TABLE patient (
     patient_id   SERIAL PRIMARY KEY,
     name         TEXT NOT NULL,
     age          INT  NOT NULL CHECK (age >= 0),
-    gender       TEXT NOT NULL,
-    blood_type   TEXT NOT NULL
+    gender       gender_enum     NOT NULL,
+    blood_type   blood_type_enum NOT NULL
 );
 
 -- Doctor
@@ -66,7 +101,7 @@ CREATE TABLE admission (
     date_of_admission TIMESTAMPTZ NOT NULL,
     discharge_date    TIMESTAMPTZ,
     room_number       INT,
-    admission_type    TEXT NOT NULL,
+    admission_type    admission_type_enum NOT NULL,
     billing_amount    NUMERIC(12,2) NOT NULL CHECK (billing_amount > 0)
 );
 
@@ -77,5 +112,5 @@ CREATE TABLE admission (
 CREATE TABLE test_result (
     test_result_id BIGSERIAL PRIMARY KEY,
     admission_id   BIGINT NOT NULL REFERENCES admission(admission_id),
-    test_result    TEXT NOT NULL
+    test_result    test_result_enum NOT NULL
 );
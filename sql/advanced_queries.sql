@@ -84,3 +84,46 @@ FROM provider_stats p
 CROSS JOIN overall o
 WHERE p.avg_bill > o.overall_avg
 ORDER BY p.avg_bill DESC;
+
+
+-- Q1 (real-time): Hospital revenue and ranking from agg_hospital_daily
+-- Same output as Q1, read from the trigger-maintained summary table
+-- (sql/migrations/003_realtime_aggregates.sql) instead of scanning admission.
+-- Add a WHERE on g.admission_day to rank over any date window.
+SELECT
+    h.hospital_name,
+    SUM(g.admissions) AS total_admissions,
+    SUM(g.billing_sum) AS total_revenue,
+    ROUND(SUM(g.billing_sum) / SUM(g.admissions), 2) AS avg_bill_per_admission,
+    RANK() OVER (ORDER BY SUM(g.billing_sum) DESC) AS revenue_rank
+FROM agg_hospital_daily g
+JOIN hospital h
+    ON g.hospital_id = h.hospital_id
+GROUP BY h.hospital_name
+ORDER BY total_revenue DESC;
+
+
+-- Q4 (real-time): Insurance providers with above-average billing from agg_insurer_daily
+WITH provider_stats AS (
+    SELECT
+        i.provider_name,
+        SUM(g.admissions) AS total_admissions,
+        SUM(g.billing_sum) / SUM(g.admissions) AS avg_bill
+    FROM agg_insurer_daily g
+    JOIN insurance_provider i
+        ON g.insurance_id = i.insurance_id
+    GROUP BY i.provider_name
+),
+overall AS (
+    SELECT SUM(billing_sum) / SUM(admissions) AS overall_avg
+    FROM agg_insurer_daily
+)
+SELECT
+    p.provider_name,
+    p.total_admissions,
+    ROUND(p.avg_bill, 2) AS avg_bill,
+    ROUND(o.overall_avg, 2) AS overall_avg_across_all_providers
+FROM provider_stats p
+CROSS JOIN overall o
+WHERE p.avg_bill > o.overall_avg
+ORDER BY p.avg_bill DESC;
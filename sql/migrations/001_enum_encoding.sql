@@ -0,0 +1,107 @@
+-- 001_enum_encoding.sql
+-- Moves the low-cardinality text columns of an existing healthcare_db to
+-- PostgreSQL enums (4 bytes per value instead of the repeated label text):
+--   patient.gender, patient.blood_type, admission.admission_type,
+--   test_result.test_result
+--
+-- New databases created from schema.sql already use these types; this script
+-- is only needed for databases created before the change. Views over the
+-- altered tables (the dbt staging models) are dropped; re-run `dbt run`
+-- afterwards. Run with:
+--   psql -U admin -d healthcare_db -f sql/migrations/001_enum_encoding.sql
+
+BEGIN;
+
+DO $$
+BEGIN
+    IF NOT EXISTS (SELECT 1 FROM pg_type WHERE typname = 'gender_enum') THEN
+        CREATE TYPE gender_enum AS ENUM ('Male', 'Female', 'Other');
+    END IF;
+    IF NOT EXISTS (SELECT 1 FROM pg_type WHERE typname = 'blood_type_enum') THEN
+        CREATE TYPE blood_type_enum AS ENUM ('A+', 'A-', 'B+', 'B-', 'AB+', 'AB-', 'O+', 'O-');
+    END IF;
+    IF NOT EXISTS (SELECT 1 FROM pg_type WHERE typname = 'admission_type_enum') THEN
+        CREATE TYPE admission_type_enum AS ENUM ('Emergency', 'Elective', 'Urgent', 'Routine');
+    END IF;
+    IF NOT EXISTS (SELECT 1 FROM pg_type WHERE typname = 'test_result_enum') THEN
+        CREATE TYPE test_result_enum AS ENUM ('Normal', 'Abnormal', 'Inconclusive');
+    END IF;
+END
+$$;
+
+-- Fail early (and readably) if the data holds labels the enums do not cover.
+DO $$
+DECLARE
+    bad TEXT;
+BEGIN
+    SELECT string_agg(DISTINCT 'patient.gender=' || gender::text, ', ') INTO bad
+    FROM patient
+    WHERE gender::text NOT IN (SELECT unnest(enum_range(NULL::gender_enum))::text);
+    IF bad IS NOT NULL THEN RAISE EXCEPTION 'Unmapped values: %', bad; END IF;
+
+    SELECT string_agg(DISTINCT 'patient.blood_type=' || blood_type::text, ', ') INTO bad
+    FROM patient
+    WHERE blood_type::text NOT IN (SELECT unnest(enum_range(NULL::blood_type_enum))::text);
+    IF bad IS NOT NULL THEN RAISE EXCEPTION 'Unmapped values: %', bad; END IF;
+
+    SELECT string_agg(DISTINCT 'admission.admission_type=' || admission_type::text, ', ') INTO bad
+    FROM admission
+    WHERE admission_type::text NOT IN (SELECT unnest(enum_range(NULL::admission_type_enum))::text);
+    IF bad IS NOT NULL THEN RAISE EXCEPTION 'Unmapped values: %', bad; END IF;
+
+    SELECT string_agg(DISTINCT 'test_result.test_result=' || test_result::text, ', ') INTO bad
+    FROM test_result
+    WHERE test_result::text NOT IN (SELECT unnest(enum_range(NULL::test_result_enum))::text);
+    IF bad IS NOT NULL THEN RAISE EXCEPTION 'Unmapped values: %', bad; END IF;
+END
+$$;
+
+-- Dependent views (e.g. analytics_staging.stg_patient / stg_admission / stg_test_result).
+-- PostgreSQL refuses to change or drop columns a view reads, so drop the views
+-- built on these tables (the dbt staging views and anything on top of them);
+-- `dbt run` recreates them afterwards.
+DO $$
+DECLARE
+    v RECORD;
+BEGIN
+    FOR v IN
+        SELECT DISTINCT vn.nspname AS view_schema, vc.relname AS view_name, vc.relkind
+        FROM pg_depend d
+        JOIN pg_rewrite r     ON r.oid = d.objid
+        JOIN pg_class vc      ON vc.oid = r.ev_class
+        JOIN pg_namespace vn  ON vn.oid = vc.relnamespace
+        JOIN pg_class tc      ON tc.oid = d.refobjid
+        JOIN pg_namespace tn  ON tn.oid = tc.relnamespace
+        WHERE d.classid = 'pg_rewrite'::regclass
+          AND d.refclassid = 'pg_class'::regclass
+          AND tn.nspname = 'public'
+          AND tc.relname IN ('patient', 'admission', 'test_result')
+          AND vc.oid <> tc.oid
+          AND vc.relkind IN ('v', 'm')
+    LOOP
+        RAISE NOTICE 'Dropping dependent view %.% (re-run dbt run afterwards)', v.view_schema, v.view_name;
+        EXECUTE format(
+            'DROP %s IF EXISTS %I.%I CASCADE',
+            CASE v.relkind WHEN 'm' THEN 'MATERIALIZED VIEW' ELSE 'VIEW' END,
+            v.view_schema, v.view_name
+        );
+    END LOOP;
+END
+$$;
+
+-- Each ALTER rewrites its table once, so the new heap is compact straight away.
+ALTER TABLE patient
+    ALTER COLUMN gender     TYPE gender_enum     USING gender::text::gender_enum,
+    ALTER COLUMN blood_type TYPE blood_type_enum USING blood_type::text::blood_type_enum;
+
+ALTER TABLE admission
+    ALTER COLUMN admission_type TYPE admission_type_enum USING admission_type::text::admission_type_enum;
+
+ALTER TABLE test_result
+    ALTER COLUMN test_result TYPE test_result_enum USING test_result::text::test_result_enum;
+
+COMMIT;
+
+ANALYZE patient;
+ANALYZE admission;
+ANALYZE test_result;
@@ -0,0 +1,80 @@
+-- 002_fold_test_result.sql  (OPTIONAL)
+-- Folds the 1:1 test_result table into admission as a compact enum column,
+-- removing one join (and one BIGSERIAL key + FK per admission) from the
+-- fact_admissions hot path. Requires 001_enum_encoding.sql (or a database
+-- created from the current schema.sql).
+--
+-- test_result is replaced by a view with the same columns, so existing
+-- readers (sql/advanced_queries.sql Q3, test.py, the dbt source) keep
+-- working. ingest_data.py and the dbt models detect the folded layout
+-- automatically. Views over the test_result table (the dbt staging models)
+-- are dropped; re-run `dbt run` afterwards. Run with:
+--   psql -U admin -d healthcare_db -f sql/migrations/002_fold_test_result.sql
+
+BEGIN;
+
+DO $$
+BEGIN
+    IF EXISTS (
+        SELECT admission_id FROM test_result GROUP BY admission_id HAVING COUNT(*) > 1
+    ) THEN
+        RAISE EXCEPTION 'test_result is not 1:1 with admission; cannot fold';
+    END IF;
+END
+$$;
+
+ALTER TABLE admission ADD COLUMN test_result test_result_enum;
+
+UPDATE admission a
+SET test_result = t.test_result
+FROM test_result t
+WHERE t.admission_id = a.admission_id;
+
+-- Dependent views (e.g. analytics_staging.stg_test_result).
+-- PostgreSQL refuses to change or drop columns a view reads, so drop the views
+-- built on these tables (the dbt staging views and anything on top of them);
+-- `dbt run` recreates them afterwards.
+DO $$
+DECLARE
+    v RECORD;
+BEGIN
+    FOR v IN
+        SELECT DISTINCT vn.nspname AS view_schema, vc.relname AS view_name, vc.relkind
+        FROM pg_depend d
+        JOIN pg_rewrite r     ON r.oid = d.objid
+        JOIN pg_class vc      ON vc.oid = r.ev_class
+        JOIN pg_namespace vn  ON vn.oid = vc.relnamespace
+        JOIN pg_class tc      ON tc.oid = d.refobjid
+        JOIN pg_namespace tn  ON tn.oid = tc.relnamespace
+        WHERE d.classid = 'pg_rewrite'::regclass
+          AND d.refclassid = 'pg_class'::regclass
+          AND tn.nspname = 'public'
+          AND tc.relname IN ('test_result')
+          AND vc.oid <> tc.oid
+          AND vc.relkind IN ('v', 'm')
+    LOOP
+        RAISE NOTICE 'Dropping dependent view %.% (re-run dbt run afterwards)', v.view_schema, v.view_name;
+        EXECUTE format(
+            'DROP %s IF EXISTS %I.%I CASCADE',
+            CASE v.relkind WHEN 'm' THEN 'MATERIALIZED VIEW' ELSE 'VIEW' END,
+            v.view_schema, v.view_name
+        );
+    END LOOP;
+END
+$$;
+
+DROP TABLE test_result;
+
+CREATE VIEW test_result AS
+SELECT
+    admission_id AS test_result_id,
+    admission_id,
+    test_result
+FROM admission
+WHERE test_result IS NOT NULL;
+
+COMMIT;
+
+-- The UPDATE above leaves one dead tuple per admission; rewrite the heap so
+-- scans read the compact layout.
+VACUUM FULL ANALYZE admission;
@@ -0,0 +1,296 @@
+-- 003_realtime_aggregates.sql
+-- Real-time per-day summary tables for the OLTP side, kept current by
+-- statement-level triggers on admission (using transition tables), so the
+-- hospital revenue ranking (Q1) and insurer averages (Q4) can be answered
+-- without scanning admission or waiting for the next `dbt run`.
+--
+--   agg_hospital_daily : one row per (hospital_id, admission_day)
+--   agg_insurer_daily  : one row per (insurance_id, admission_day)
+--
+-- Days are taken in UTC so every session maintains the same buckets,
+-- whatever its TimeZone setting. Run with:
+--   psql -U admin -d healthcare_db -f sql/migrations/003_realtime_aggregates.sql
+-- Check the tables against a full recompute with reconcile_aggregates.py.
+
+BEGIN;
+
+-- =========================
+-- Summary tables
+-- =========================
+
+CREATE TABLE IF NOT EXISTS agg_hospital_daily (
+    hospital_id    INT           NOT NULL,
+    admission_day  DATE          NOT NULL,
+    admissions     BIGINT        NOT NULL,
+    billing_sum    NUMERIC(16,2) NOT NULL,
+    los_days_sum   BIGINT        NOT NULL,  -- over discharged admissions only
+    discharged     BIGINT        NOT NULL,
+    PRIMARY KEY (hospital_id, admission_day)
+);
+
+CREATE TABLE IF NOT EXISTS agg_insurer_daily (
+    insurance_id   INT           NOT NULL,
+    admission_day  DATE          NOT NULL,
+    admissions     BIGINT        NOT NULL,
+    billing_sum    NUMERIC(16,2) NOT NULL,
+    los_days_sum   BIGINT        NOT NULL,
+    discharged     BIGINT        NOT NULL,
+    PRIMARY KEY (insurance_id, admission_day)
+);
+
+-- Signed per-row contribution: +1 for new rows, -1 for old rows.
+DROP TYPE IF EXISTS admission_agg_delta CASCADE;
+CREATE TYPE admission_agg_delta AS (
+    hospital_id   INT,
+    insurance_id  INT,
+    admission_day DATE,
+    admissions    BIGINT,
+    billing       NUMERIC,
+    los_days      BIGINT,
+    discharged    BIGINT
+);
+
+-- =========================
+-- Apply a batch of deltas to both summary tables
+-- =========================
+
+CREATE OR REPLACE FUNCTION admission_agg_apply(deltas admission_agg_delta[])
+RETURNS void
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    IF deltas IS NULL THEN
+        RETURN;
+    END IF;
+
+    -- ORDER BY keeps the row-lock order stable across concurrent writers.
+    INSERT INTO agg_hospital_daily AS g
+        (hospital_id, admission_day, admissions, billing_sum, los_days_sum, discharged)
+    SELECT hospital_id, admission_day,
+           SUM(admissions), SUM(billing), COALESCE(SUM(los_days), 0), SUM(discharged)
+    FROM unnest(deltas)
+    GROUP BY hospital_id, admission_day
+    ORDER BY hospital_id, admission_day
+    ON CONFLICT (hospital_id, admission_day) DO UPDATE SET
+        admissions   = g.admissions   + EXCLUDED.admissions,
+        billing_sum  = g.billing_sum  + EXCLUDED.billing_sum,
+        los_days_sum = g.los_days_sum + EXCLUDED.los_days_sum,
+        discharged   = g.discharged   + EXCLUDED.discharged;
+
+    INSERT INTO agg_insurer_daily AS g
+        (insurance_id, admission_day, admissions, billing_sum, los_days_sum, discharged)
+    SELECT insurance_id, admission_day,
+           SUM(admissions), SUM(billing), COALESCE(SUM(los_days), 0), SUM(discharged)
+    FROM unnest(deltas)
+    GROUP BY insurance_id, admission_day
+    ORDER BY insurance_id, admission_day
+    ON CONFLICT (insurance_id, admission_day) DO UPDATE SET
+        admissions   = g.admissions   + EXCLUDED.admissions,
+        billing_sum  = g.billing_sum  + EXCLUDED.billing_sum,
+        los_days_sum = g.los_days_sum + EXCLUDED.los_days_sum,
+        discharged   = g.discharged   + EXCLUDED.discharged;
+
+    -- Drop buckets that no longer hold any admission.
+    DELETE FROM agg_hospital_daily g
+    USING (SELECT DISTINCT hospital_id, admission_day FROM unnest(deltas)) d
+    WHERE g.hospital_id = d.hospital_id
+      AND g.admission_day = d.admission_day
+      AND g.admissions = 0;
+
+    DELETE FROM agg_insurer_daily g
+    USING (SELECT DISTINCT insurance_id, admission_day FROM unnest(deltas)) d
+    WHERE g.insurance_id = d.insurance_id
+      AND g.admission_day = d.admission_day
+      AND g.admissions = 0;
+END
+$$;
+
+-- =========================
+-- Statement-level trigger function
+-- =========================
+
+CREATE OR REPLACE FUNCTION admission_agg_trigger()
+RETURNS trigger
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    deltas admission_agg_delta[];
+BEGIN
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        SELECT array_agg(ROW(
+                   hospital_id,
+                   insurance_id,
+                   (date_of_admission AT TIME ZONE 'UTC')::date,
+                   1,
+                   billing_amount,
+                   (discharge_date AT TIME ZONE 'UTC')::date - (date_of_admission AT TIME ZONE 'UTC')::date,
+                   (discharge_date IS NOT NULL)::int
+               )::admission_agg_delta)
+        INTO deltas
+        FROM new_rows;
+        PERFORM admission_agg_apply(deltas);
+    END IF;
+
+    IF TG_OP IN ('DELETE', 'UPDATE') THEN
+        SELECT array_agg(ROW(
+                   hospital_id,
+                   insurance_id,
+                   (date_of_admission AT TIME ZONE 'UTC')::date,
+                   -1,
+                   -billing_amount,
+                   -((discharge_date AT TIME ZONE 'UTC')::date - (date_of_admission AT TIME ZONE 'UTC')::date),
+                   -(discharge_date IS NOT NULL)::int
+               )::admission_agg_delta)
+        INTO deltas
+        FROM old_rows;
+        PERFORM admission_agg_apply(deltas);
+    END IF;
+
+    RETURN NULL;
+END
+$$;
+
+CREATE OR REPLACE FUNCTION admission_agg_truncate()
+RETURNS trigger
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    TRUNCATE agg_hospital_daily, agg_insurer_daily;
+    RETURN NULL;
+END
+$$;
+
+-- Transition tables allow only one event per trigger, hence three triggers.
+DROP TRIGGER IF EXISTS admission_agg_ins ON admission;
+DROP TRIGGER IF EXISTS admission_agg_upd ON admission;
+DROP TRIGGER IF EXISTS admission_agg_del ON admission;
+DROP TRIGGER IF EXISTS admission_agg_trunc ON admission;
+
+CREATE TRIGGER admission_agg_ins
+    AFTER INSERT ON admission
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION admission_agg_trigger();
+
+CREATE TRIGGER admission_agg_upd
+    AFTER UPDATE ON admission
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION admission_agg_trigger();
+
+CREATE TRIGGER admission_agg_del
+    AFTER DELETE ON admission
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION admission_agg_trigger();
+
+CREATE TRIGGER admission_agg_trunc
+    AFTER TRUNCATE ON admission
+    FOR EACH STATEMENT EXECUTE FUNCTION admission_agg_truncate();
+
+-- =========================
+-- Full recompute (used for the initial backfill and by reconcile --repair)
+-- =========================
+
+CREATE OR REPLACE FUNCTION admission_agg_rebuild()
+RETURNS void
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    -- Block concurrent writers so no delta is lost between recompute and swap.
+    LOCK TABLE admission IN SHARE MODE;
+    TRUNCATE agg_hospital_daily, agg_insurer_daily;
+
+    INSERT INTO agg_hospital_daily
+    SELECT * FROM admission_agg_expected_hospital();
+
+    INSERT INTO agg_insurer_daily
+    SELECT * FROM admission_agg_expected_insurer();
+END
+$$;
+
+CREATE OR REPLACE FUNCTION admission_agg_expected_hospital()
+RETURNS SETOF agg_hospital_daily
+LANGUAGE sql STABLE
+AS $$
+    SELECT
+        hospital_id,
+        (date_of_admission AT TIME ZONE 'UTC')::date,
+        COUNT(*),
+        SUM(billing_amount),
+        COALESCE(SUM((discharge_date AT TIME ZONE 'UTC')::date - (date_of_admission AT TIME ZONE 'UTC')::date), 0),
+        COUNT(discharge_date)
+    FROM admission
+    GROUP BY 1, 2
+$$;
+
+CREATE OR REPLACE FUNCTION admission_agg_expected_insurer()
+RETURNS SETOF agg_insurer_daily
+LANGUAGE sql STABLE
+AS $$
+    SELECT
+        insurance_id,
+        (date_of_admission AT TIME ZONE 'UTC')::date,
+        COUNT(*),
+        SUM(billing_amount),
+        COALESCE(SUM((discharge_date AT TIME ZONE 'UTC')::date - (date_of_admission AT TIME ZONE 'UTC')::date), 0),
+        COUNT(discharge_date)
+    FROM admission
+    GROUP BY 1, 2
+$$;
+
+-- =========================
+-- Reconciliation: stored summaries vs. a full recompute
+-- =========================
+-- Returns one row per bucket that differs (missing, extra or wrong values).
+
+CREATE OR REPLACE FUNCTION admission_agg_reconcile()
+RETURNS TABLE (
+    agg_table           TEXT,
+    key_id              INT,
+    admission_day       DATE,
+    stored_admissions   BIGINT,
+    expected_admissions BIGINT,
+    stored_billing      NUMERIC,
+    expected_billing    NUMERIC,
+    stored_los_days     BIGINT,
+    expected_los_days   BIGINT,
+    stored_discharged   BIGINT,
+    expected_discharged BIGINT
+)
+LANGUAGE sql STABLE
+AS $$
+    SELECT
+        'agg_hospital_daily',
+        COALESCE(s.hospital_id, e.hospital_id),
+        COALESCE(s.admission_day, e.admission_day),
+        s.admissions, e.admissions,
+        s.billing_sum, e.billing_sum,
+        s.los_days_sum, e.los_days_sum,
+        s.discharged, e.discharged
+    FROM agg_hospital_daily s
+    FULL JOIN admission_agg_expected_hospital() e
+        ON s.hospital_id = e.hospital_id
+       AND s.admission_day = e.admission_day
+    WHERE (s.admissions, s.billing_sum, s.los_days_sum, s.discharged)
+          IS DISTINCT FROM (e.admissions, e.billing_sum, e.los_days_sum, e.discharged)
+
+    UNION ALL
+
+    SELECT
+        'agg_insurer_daily',
+        COALESCE(s.insurance_id, e.insurance_id),
+        COALESCE(s.admission_day, e.admission_day),
+        s.admissions, e.admissions,
+        s.billing_sum, e.billing_sum,
+        s.los_days_sum, e.los_days_sum,
+        s.discharged, e.discharged
+    FROM agg_insurer_daily s
+    FULL JOIN admission_agg_expected_insurer() e
+        ON s.insurance_id = e.insurance_id
+       AND s.admission_day = e.admission_day
+    WHERE (s.admissions, s.billing_sum, s.los_days_sum, s.discharged)
+          IS DISTINCT FROM (e.admissions, e.billing_sum, e.los_days_sum, e.discharged)
+$$;
+
+-- Initial backfill from the rows already in admission.
+SELECT admission_agg_rebuild();
+
+COMMIT;